@@ -0,0 +1,73 @@
+"""
+Chart aggregation for GridToDash
+Groups rows by the X-axis column so files with repeated categories (one row
+per invoice, many per customer) chart real totals instead of duplicate bars.
+Results are small and kept in their own cache, keyed by dataset and settings.
+"""
+
+import os
+
+import pandas as pd
+
+from dataset_cache import LRUCache
+from numeric_parsing import convert_numeric_text
+
+
+AGGREGATIONS = ('sum', 'mean', 'count', 'max')
+
+# Memory budget for grouped chart data, in megabytes
+AGGREGATE_CACHE_MB = float(os.getenv("GRIDTODASH_AGG_CACHE_MB", "64"))
+
+AGGREGATE_CACHE = LRUCache(int(AGGREGATE_CACHE_MB * 1024 * 1024))
+
+
+def _check(aggregation):
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation '{aggregation}' (use one of: {', '.join(AGGREGATIONS)}).")
+
+
+def aggregate(df, x_axis_col, value_cols, aggregation):
+    """
+    Group df by x_axis_col and aggregate value_cols.
+    Returns a DataFrame indexed by the group labels (missing labels form
+    their own group); only categories that occur are kept.
+    """
+    _check(aggregation)
+    # An unnamed key keeps x_axis_col among the values when it is also charted
+    grouped = df[value_cols].groupby(df[x_axis_col].rename(None), sort=False, observed=True, dropna=False)
+    return grouped.agg(aggregation).rename_axis(x_axis_col)
+
+
+def _combine(partial, aggregation):
+    """Merge partial results whose index may repeat group labels."""
+    grouped = partial.groupby(level=0, sort=False, dropna=False)
+    return grouped.max() if aggregation == 'max' else grouped.sum()
+
+
+def aggregate_csv(source, x_axis_col, value_cols, aggregation, text_formats=None, chunk_rows=100000):
+    """
+    Same as aggregate() for a CSV that is too large to load: reads only the
+    needed columns in chunks and merges the per-chunk groups. text_formats
+    are the numeric text columns found while streaming the file.
+    """
+    _check(aggregation)
+    text_formats = text_formats or {}
+    source.seek(0)
+    usecols = list(dict.fromkeys([x_axis_col] + list(value_cols)))
+    # mean is sum / count, and counts are summed across chunks
+    steps = ('sum', 'count') if aggregation == 'mean' else (aggregation,)
+
+    partial = None
+    for chunk in pd.read_csv(source, usecols=usecols, chunksize=chunk_rows):
+        for col, decimal in text_formats.items():
+            if col in chunk:
+                chunk[col] = convert_numeric_text(chunk[col], decimal)
+        grouped = chunk[value_cols].groupby(chunk[x_axis_col].rename(None), sort=False, dropna=False)
+        parts = pd.concat([grouped.agg(step) for step in steps], axis=1, keys=steps)
+        partial = parts if partial is None else _combine(pd.concat([partial, parts]), aggregation)
+
+    if partial is None:
+        return pd.DataFrame(columns=value_cols)
+    if aggregation == 'mean':
+        return (partial['sum'] / partial['count']).rename_axis(x_axis_col)
+    return partial[aggregation].rename_axis(x_axis_col)
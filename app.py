@@ -4,19 +4,24 @@ A professional IterioTech application for small business owners to convert
 Excel/CSV files into polished, branded PDF reports.
 """
 
+import startup  # first: its clock starts with the first app run
+
 import os
-import tempfile
+import time
+import uuid
 import base64
 from datetime import datetime
 from io import BytesIO
 
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-from fpdf import FPDF
 
 # Import login module
 from login import show_login
+from dataset_cache import DATASET_CACHE
+from background import release
+
+# pandas, Matplotlib and FPDF (the data, chart and PDF modules) are imported
+# by the first upload, so the login page does not wait for them
 
 # Get the redirect URL - can be set via environment variable for production
 # For Streamlit Cloud, set this environment variable to your app's URL
@@ -49,9 +54,15 @@ TRANSLATIONS = {
         "total_records": "Total de Registos",
         "total_sum": "Soma Total",
         "average_value": "Valor Médio",
+        "min_value": "Mínimo",
+        "max_value": "Máximo",
+        "std_dev": "Desvio Padrão",
+        "missing_values": "{count:,} valores em falta em {column}",
         "data_preview": "Pré-visualização dos Dados",
         "chart_title": "Gráfico",
+        "interactive_chart": "Gráfico interativo",
         "generate_pdf": "Gerar Relatório PDF",
+        "pdf_full_table": "Incluir todas as linhas na tabela do PDF",
         "processing": "A processar o seu ficheiro...",
         "generating_pdf": "A gerar o relatório PDF...",
         "success_message": "PDF Ready! O seu relatório está pronto para download.",
@@ -63,7 +74,23 @@ TRANSLATIONS = {
         "select_column": "Selecionar coluna para métricas",
         "select_x_axis": "Selecionar coluna para eixo X",
         "select_y_axis": "Selecionar coluna para eixo Y",
+        "select_aggregation": "Agrupar gráfico por eixo X",
+        "agg_none": "Sem agrupamento (linhas)",
+        "agg_sum": "Soma",
+        "agg_mean": "Média",
+        "agg_count": "Contagem",
+        "agg_max": "Máximo",
         "select_columns_pdf": "Selecionar colunas para o relatório PDF",
+        "select_sheet": "Selecionar folha do Excel",
+        "memory_saved": "Memória otimizada: {size:,.1f} MB poupados",
+        "text_columns": "Lidas como texto, porque têm texto mais abaixo no ficheiro: {columns}",
+        "loading_full": "A carregar o ficheiro completo...",
+        "load_progress": "A carregar: {rows:,} linhas · {done:,.1f} de {total:,.1f} MB · faltam {eta}",
+        "batch_title": "Modo em lote (vários ficheiros)",
+        "batch_uploader": "Escolha vários ficheiros Excel ou CSV",
+        "batch_generate": "Gerar relatórios em ZIP",
+        "batch_done": "{ok} relatórios gerados, {failed} com erro.",
+        "batch_download": "Download do ZIP de relatórios",
         "about": "Sobre",
         "sidebar_tooltip": "Abrir menu de idiomas",
     },
@@ -84,9 +111,15 @@ TRANSLATIONS = {
         "total_records": "Total Records",
         "total_sum": "Total Sum",
         "average_value": "Average Value",
+        "min_value": "Minimum",
+        "max_value": "Maximum",
+        "std_dev": "Standard Deviation",
+        "missing_values": "{count:,} missing values in {column}",
         "data_preview": "Data Preview",
         "chart_title": "Chart",
+        "interactive_chart": "Interactive chart",
         "generate_pdf": "Generate PDF Report",
+        "pdf_full_table": "Include every row in the PDF table",
         "processing": "Processing your file...",
         "generating_pdf": "Generating PDF report...",
         "success_message": "PDF Ready! Your report is ready for download.",
@@ -98,7 +131,23 @@ TRANSLATIONS = {
         "select_column": "Select column for metrics",
         "select_x_axis": "Select column for X-axis",
         "select_y_axis": "Select column for Y-axis",
+        "select_aggregation": "Group chart by X-axis",
+        "agg_none": "No grouping (rows)",
+        "agg_sum": "Sum",
+        "agg_mean": "Mean",
+        "agg_count": "Count",
+        "agg_max": "Maximum",
         "select_columns_pdf": "Select columns for PDF report",
+        "select_sheet": "Select Excel sheet",
+        "memory_saved": "Memory optimized: {size:,.1f} MB saved",
+        "text_columns": "Read as text because they hold text further down the file: {columns}",
+        "loading_full": "Loading the full file...",
+        "load_progress": "Loading: {rows:,} rows · {done:,.1f} of {total:,.1f} MB · {eta} left",
+        "batch_title": "Batch mode (multiple files)",
+        "batch_uploader": "Choose multiple Excel or CSV files",
+        "batch_generate": "Generate reports as ZIP",
+        "batch_done": "{ok} reports generated, {failed} failed.",
+        "batch_download": "Download reports ZIP",
         "about": "About",
         "sidebar_tooltip": "Open language menu",
     }
@@ -452,203 +501,20 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-def load_data(uploaded_file):
-    """
-    Load Excel or CSV file into a Pandas DataFrame.
-    Handles both .xlsx and .csv formats.
-    """
-    try:
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
-        else:
-            df = pd.read_excel(uploaded_file, engine='openpyxl')
-        
-        if df.empty:
-            raise ValueError("The uploaded file is empty.")
-        
-        return df
-    except Exception as e:
-        raise ValueError(f"Error loading file: {str(e)}")
-
-
-def identify_numeric_columns(df):
-    """Identify and return list of numeric columns in the DataFrame."""
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-    if not numeric_cols:
-        raise ValueError("No numeric columns found in the uploaded file.")
-    return numeric_cols
-
-
-def calculate_key_metrics(df, selected_column):
-    """
-    Calculate key metrics from the DataFrame.
-    Returns: Total Records, Total Sum, Average Value for selected column.
-    """
-    total_records = len(df)
-    total_sum = df[selected_column].sum()
-    average_value = df[selected_column].mean()
-    
-    return {
-        'total_records': total_records,
-        'total_sum': total_sum,
-        'average_value': average_value,
-        'primary_column': selected_column
-    }
-
-
-def generate_bar_chart(df, x_axis_col, y_axis_col, numeric_cols):
-    """
-    Generate a bar chart showing top entries by value.
-    Uses selected column for X-axis labels and Y-axis values.
-    """
-    primary_col = y_axis_col
-    
-    # Limit to max 100 rows
-    max_rows = min(100, len(df))
-    top_data = df.nlargest(max_rows, primary_col)
-    
-    # Get labels from X-axis column
-    labels = top_data[x_axis_col].astype(str).tolist()
-    
-    # Calculate dynamic figure size based on number of entries
-    fig_height = min(6 + (max_rows / 20), 12)
-    fig, ax = plt.subplots(figsize=(12, fig_height))
-    
-    # Use different colors for bars
-    colors = ['#059669', '#0EA5E9', '#8B5CF6', '#F59E0B', '#EC4899']
-    
-    if len(numeric_cols) > 1:
-        # Grouped bar chart for multiple columns
-        x = range(len(top_data))
-        width = 0.8 / len(numeric_cols)
-        
-        for i, col in enumerate(numeric_cols[:5]):  # Max 5 columns
-            values = [float(top_data[col].iloc[j]) for j in range(len(top_data))]
-            ax.bar([xi + i * width for xi in x], values, width, label=col, color=colors[i % len(colors)])
-        
-        ax.set_xticks([xi + width * (len(numeric_cols[:5]) - 1) / 2 for xi in x])
-        ax.set_xticklabels(labels, rotation=45, ha='right', fontsize=9)
-        ax.legend(loc='upper right', fontsize=8)
-    else:
-        # Single column bar chart
-        values = top_data[primary_col].values
-        ax.bar(range(len(top_data)), values, color='#059669', edgecolor='#047857')
-        ax.set_xticks(range(len(top_data)))
-        ax.set_xticklabels(labels, rotation=45, ha='right', fontsize=9)
-    
-    ax.set_xlabel(x_axis_col)
-    ax.set_ylabel(y_axis_col)
-    ax.set_title(f'{x_axis_col} by {y_axis_col} ({len(top_data)} entries)', color='#1E3A5F', fontweight='bold')
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.grid(axis='y', alpha=0.3)
-    
-    buf = BytesIO()
-    plt.tight_layout()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-    plt.close(fig)
-    buf.seek(0)
-    return buf
-
-
-class PDFReport(FPDF):
-    """Custom PDF Report Generator using FPDF."""
-    
-    def header(self):
-        self.set_font('Arial', 'B', 16)
-        self.set_text_color(30, 58, 95)
-        self.cell(0, 10, 'GridToDash Professional Report', 0, 1, 'C')
-        self.ln(5)
-    
-    def footer(self):
-        self.set_y(-20)
-        self.set_font('Arial', 'I', 8)
-        self.set_text_color(128, 128, 128)
-        self.cell(0, 10, 'Generated by GridToDash - Professional Automation', 0, 0, 'C')
-
-
-def create_pdf(df, metrics, chart_buf, filename):
-    """
-    Create a PDF report with header, metrics, chart, and data table.
-    """
-    total_rows = len(df)
-    pdf = PDFReport()
-    pdf.add_page()
-    
-    # Current Date
-    pdf.set_font('Arial', '', 10)
-    pdf.set_text_color(100, 100, 100)
-    pdf.cell(0, 10, f'Report Generated: {datetime.now().strftime("%Y-%m-%d %H:%M")}', 0, 1, 'R')
-    pdf.ln(5)
-    
-    # Key Metrics Section
-    pdf.set_font('Arial', 'B', 14)
-    pdf.set_text_color(30, 58, 95)
-    pdf.cell(0, 10, 'Key Metrics', 0, 1, 'L')
-    pdf.ln(5)
-    
-    pdf.set_font('Arial', '', 11)
-    pdf.set_text_color(0, 0, 0)
-    pdf.cell(60, 8, f"Total Records: {metrics['total_records']}", 0, 0, 'L')
-    pdf.cell(60, 8, f"Total Sum: {metrics['total_sum']:,.2f}", 0, 0, 'L')
-    pdf.cell(60, 8, f"Average Value: {metrics['average_value']:,.2f}", 0, 1, 'L')
-    pdf.ln(10)
-    
-    # All Columns Info
-    pdf.set_font('Arial', 'B', 12)
-    pdf.set_text_color(30, 58, 95)
-    all_cols = df.columns.tolist()
-    pdf.cell(0, 8, f"Columns in data: {', '.join(all_cols)}", 0, 1, 'L')
-    pdf.ln(5)
-    
-    # Chart Section
-    pdf.set_font('Arial', 'B', 14)
-    pdf.set_text_color(30, 58, 95)
-    pdf.cell(0, 10, f'Chart ({min(total_rows, 100)} Entries)', 0, 1, 'L')
-    pdf.ln(5)
-    
-    chart_path = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-    chart_path.write(chart_buf.getvalue())
-    chart_path.close()
-    pdf.image(chart_path.name, x=10, w=190)
-    os.unlink(chart_path.name)
-    pdf.ln(10)
-    
-    # Data Table Section
-    pdf.set_font('Arial', 'B', 14)
-    pdf.set_text_color(30, 58, 95)
-    pdf.cell(0, 10, f'Data Preview (First {min(total_rows, 100)} Rows)', 0, 1, 'L')
-    pdf.ln(5)
-    
-    # Table Header
-    pdf.set_font('Arial', 'B', 7)
-    pdf.set_fill_color(30, 58, 95)
-    pdf.set_text_color(255, 255, 255)
-    
-    columns = df.columns.tolist()
-    num_cols = len(columns)
-    
-    # Calculate column width - dynamic based on number of columns
-    max_width = 195
-    col_width = min(22, max_width / num_cols)
-    
-    # Print header
-    for col in columns:
-        pdf.cell(col_width, 7, str(col)[:10], 1, 0, 'C', True)
-    pdf.ln()
-    
-    # Table Rows
-    pdf.set_font('Arial', '', 7)
-    pdf.set_text_color(0, 0, 0)
-    
-    # Show up to 20 rows for better data preview
-    for idx, row in df.head(100).iterrows():
-        for col in columns:
-            cell_value = str(row[col])[:12]
-            pdf.cell(col_width, 6, cell_value, 1, 0, 'C')
-        pdf.ln()
-    
-    return pdf.output(dest='S').encode('latin-1')
+def wait_for_load(job):
+    """Show parse progress until a background load finishes, then return its dataset."""
+    bar = st.progress(0.0, text=get_translation("loading_full"))
+    while not job.future.done():
+        eta = job.eta_seconds
+        bar.progress(job.fraction, text=get_translation("load_progress").format(
+            rows=job.rows,
+            done=job.bytes_done / (1024 * 1024),
+            total=job.size_bytes / (1024 * 1024),
+            eta=f"{eta:.0f}s" if eta is not None else "..."
+        ))
+        time.sleep(0.25)
+    bar.empty()
+    return job.future.result()
 
 
 def main():
@@ -693,6 +559,7 @@ def main():
     # Check authentication - show login if not authenticated
     if not st.session_state.get("authenticated"):
         show_login()
+        startup.mark("login page shown")
         return
     
     # Show logout button in main area
@@ -756,16 +623,68 @@ def main():
         help=get_translation("file_uploader_help")
     )
     
+    # Identifies this browser session to the shared background loads
+    if "session_token" not in st.session_state:
+        st.session_state.session_token = uuid.uuid4().hex
+    if uploaded_file is None:
+        release(st.session_state.session_token)
+    startup.mark("app page shown")
+    
     if uploaded_file is not None:
+        with startup.timed("data modules loaded"):
+            from xlsx_reader import list_sheets
+            from pipeline import (
+                dataset_cache_key,
+                preview_first,
+                load_preview,
+                load_dataset,
+                dataset_summary,
+                dataset_profile,
+                default_columns,
+                calculate_key_metrics,
+                bar_chart,
+                interactive_bar_chart,
+                chart_spec,
+                table_blocks,
+                create_pdf,
+                report_key,
+                cached_report,
+            )
+            from background import load_in_background
         try:
-            # Load and process data
+            # Sheet selector for workbooks with more than one sheet
+            sheet_name = None
+            if not uploaded_file.name.endswith('.csv'):
+                sheets = list_sheets(uploaded_file)
+                if len(sheets) > 1:
+                    sheet_name = st.selectbox(
+                        get_translation("select_sheet"),
+                        options=sheets,
+                        key="sheet_selector"
+                    )
+            
+            # Load and process data - large uploads start with a preview
+            # while the full file is parsed in the background
+            full_load = None
             with st.spinner(get_translation('processing')):
-                df = load_data(uploaded_file)
-                numeric_cols = identify_numeric_columns(df)
+                key = dataset_cache_key(uploaded_file, sheet_name)
+                # A different file (or sheet) than before: stop loading the old one
+                release(st.session_state.session_token, keep=key)
+                dataset = DATASET_CACHE.get(key)
+                if dataset is None and preview_first(uploaded_file.size):
+                    dataset = load_preview(uploaded_file, sheet_name, key)
+                    full_load = load_in_background(uploaded_file, sheet_name, key,
+                                                   st.session_state.session_token)
+                elif dataset is None:
+                    dataset = load_dataset(uploaded_file, sheet_name, key)
+                df = dataset['df']
+                numeric_cols = list(dataset['numeric_cols'])
+                # Defaults come from the column profile: skip ID columns, label by text
+                defaults = default_columns(dataset)
             
             # Initialize selected column in session state if not set or if columns changed
             if 'selected_column' not in st.session_state or st.session_state.get('numeric_cols') != numeric_cols:
-                st.session_state.selected_column = numeric_cols[0] if numeric_cols else None
+                st.session_state.selected_column = defaults['metric']
                 st.session_state.numeric_cols = numeric_cols
             
             # Column selector for metrics
@@ -777,14 +696,14 @@ def main():
             )
             st.session_state.selected_column = selected_col
             
-            # X-axis and Y-axis selectors
-            col_x, col_y = st.columns(2)
+            # X-axis, Y-axis and grouping selectors
+            col_x, col_y, col_agg = st.columns(3)
             with col_x:
                 all_cols = df.columns.tolist()
                 x_axis_col = st.selectbox(
                     get_translation("select_x_axis"),
                     options=all_cols,
-                    index=0,
+                    index=all_cols.index(defaults['x_axis']),
                     key="x_axis_selector"
                 )
             with col_y:
@@ -794,7 +713,15 @@ def main():
                     index=numeric_cols.index(selected_col) if selected_col in numeric_cols else 0,
                     key="y_axis_selector"
                 )
-            
+            with col_agg:
+                # Group repeated X-axis values (e.g. one row per invoice) into one bar
+                aggregation = st.selectbox(
+                    get_translation("select_aggregation"),
+                    options=[None, 'sum', 'mean', 'count', 'max'],
+                    format_func=lambda agg: get_translation(f"agg_{agg or 'none'}"),
+                    key="aggregation_selector"
+                )
+
             # Columns selector for PDF
             pdf_columns = st.multiselect(
                 get_translation("select_columns_pdf"),
@@ -803,52 +730,117 @@ def main():
                 key="pdf_columns_selector"
             )
             
-            # Calculate metrics for selected column
-            metrics = calculate_key_metrics(df, selected_col)
-            
-            # Display Key Metrics
-            st.markdown(f'<p class="section-header">{get_translation("key_metrics")}</p>', unsafe_allow_html=True)
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.markdown(f"""
-                <div class="metric-card" style="animation-delay: 0.1s;">
-                    <h3>{get_translation("total_records")}</h3>
-                    <p class="value navy">{metrics['total_records']:,}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            with col2:
-                st.markdown(f"""
-                <div class="metric-card" style="animation-delay: 0.2s;">
-                    <h3>{get_translation("total_sum")} ({selected_col})</h3>
-                    <p class="value green">{metrics['total_sum']:,.2f}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            with col3:
-                st.markdown(f"""
-                <div class="metric-card" style="animation-delay: 0.3s;">
-                    <h3>{get_translation("average_value")} ({selected_col})</h3>
-                    <p class="value blue">{metrics['average_value']:,.2f}</p>
-                </div>
-                """, unsafe_allow_html=True)
+            # Metrics are filled in below, once the full dataset is ready
+            metrics_area = st.container()
             
             # Display Data Preview
             st.markdown(f'<p class="section-header" style="margin-top: 30px;">{get_translation("data_preview")}</p>', unsafe_allow_html=True)
             st.dataframe(df[pdf_columns].head(10), width='stretch')
+            preview_note = st.empty()
+            
+            # Metrics, chart and PDF need every row: wait for the background load
+            if full_load is not None:
+                dataset = wait_for_load(full_load)
+                df = dataset['df']
+                if list(dataset['numeric_cols']) != numeric_cols:
+                    # The full file has other numeric columns than its first rows
+                    st.rerun()
+            if dataset.get('bytes_saved', 0) > 0:
+                preview_note.caption(get_translation("memory_saved").format(size=dataset['bytes_saved'] / (1024 * 1024)))
+            # Numbers-as-text columns of a streamed CSV that turned out to be text
+            text_columns = dataset.get('summary', {}).get('text_columns')
+            if text_columns:
+                st.warning(get_translation("text_columns").format(columns=', '.join(text_columns)))
+            
+            # Statistics for all numeric columns are computed once per dataset
+            metrics = calculate_key_metrics(df, selected_col, dataset_summary(dataset))
+            
+            with metrics_area:
+                # Display Key Metrics
+                st.markdown(f'<p class="section-header">{get_translation("key_metrics")}</p>', unsafe_allow_html=True)
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.markdown(f"""
+                    <div class="metric-card" style="animation-delay: 0.1s;">
+                        <h3>{get_translation("total_records")}</h3>
+                        <p class="value navy">{metrics['total_records']:,}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                with col2:
+                    st.markdown(f"""
+                    <div class="metric-card" style="animation-delay: 0.2s;">
+                        <h3>{get_translation("total_sum")} ({selected_col})</h3>
+                        <p class="value green">{metrics['total_sum']:,.2f}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                with col3:
+                    st.markdown(f"""
+                    <div class="metric-card" style="animation-delay: 0.3s;">
+                        <h3>{get_translation("average_value")} ({selected_col})</h3>
+                        <p class="value blue">{metrics['average_value']:,.2f}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                col4, col5, col6 = st.columns(3)
+                with col4:
+                    st.markdown(f"""
+                    <div class="metric-card" style="animation-delay: 0.4s;">
+                        <h3>{get_translation("min_value")} ({selected_col})</h3>
+                        <p class="value navy">{metrics['min_value']:,.2f}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                with col5:
+                    st.markdown(f"""
+                    <div class="metric-card" style="animation-delay: 0.5s;">
+                        <h3>{get_translation("max_value")} ({selected_col})</h3>
+                        <p class="value green">{metrics['max_value']:,.2f}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                with col6:
+                    st.markdown(f"""
+                    <div class="metric-card" style="animation-delay: 0.6s;">
+                        <h3>{get_translation("std_dev")} ({selected_col})</h3>
+                        <p class="value blue">{metrics['std_dev']:,.2f}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                if metrics['missing_values']:
+                    st.caption(get_translation("missing_values").format(count=metrics['missing_values'], column=selected_col))
             
             # Get numeric columns from selected PDF columns for chart
             chart_numeric_cols = [col for col in pdf_columns if col in numeric_cols] if pdf_columns else numeric_cols
             
             # Generate Chart
             st.markdown(f'<p class="section-header">{get_translation("chart_title")}</p>', unsafe_allow_html=True)
-            chart_buf = generate_bar_chart(df, x_axis_col, y_axis_col, chart_numeric_cols if chart_numeric_cols else numeric_cols)
-            st.image(chart_buf, width='stretch')
+            chart_cols = chart_numeric_cols if chart_numeric_cols else numeric_cols
+            if st.toggle(get_translation("interactive_chart"), value=True, key="interactive_chart"):
+                # Drawn by the browser from downsampled data: zoom and hover need no rerun
+                chart = interactive_bar_chart(dataset, x_axis_col, y_axis_col, chart_cols, aggregation, uploaded_file)
+                st.vega_lite_chart(chart['data'], chart['spec'], width='stretch')
+            else:
+                # Rendered once per dataset and chart settings
+                chart_buf = bar_chart(dataset, x_axis_col, y_axis_col, chart_cols, aggregation, uploaded_file)
+                st.image(chart_buf, width='stretch')
             
             # Generate PDF Button
+            full_table = st.checkbox(get_translation("pdf_full_table"), key="pdf_full_table")
             if st.button(get_translation("generate_pdf")):
                 with st.spinner(get_translation('generating_pdf')):
                     # Create PDF with selected columns
                     df_pdf = df[pdf_columns] if pdf_columns else df
-                    pdf_bytes = create_pdf(df_pdf, metrics, chart_buf, uploaded_file.name)
+                    # Same file and settings: the report comes from the PDF cache,
+                    # also when another session or replica made it
+                    key = report_key(dataset['key'], metric=selected_col, x_axis=x_axis_col,
+                                     y_axis=y_axis_col, columns=df_pdf.columns.tolist(),
+                                     chart_columns=list(chart_cols), aggregation=aggregation,
+                                     full_table=full_table, language=st.session_state.language)
+                    
+                    def render(f):
+                        # The PDF draws the chart as vector graphics
+                        chart = chart_spec(dataset, x_axis_col, y_axis_col, chart_cols, aggregation, uploaded_file)
+                        # Every row, read block by block, instead of the first 100
+                        table = table_blocks(dataset, df_pdf.columns.tolist(), uploaded_file) if full_table else None
+                        create_pdf(df_pdf, metrics, chart, uploaded_file.name, dataset_profile(dataset),
+                                   table, f, key)
+                    pdf_bytes = cached_report(key, render)
                     
                     # Success Message
                     st.markdown(f"""
@@ -876,6 +868,46 @@ def main():
             st.error(error_msg)
         except Exception as e:
             st.error(get_translation("error_unexpected") + str(e))
+    
+    # Batch Mode - many files into one ZIP of PDFs
+    with st.expander(get_translation("batch_title")):
+        batch_files = st.file_uploader(
+            get_translation("batch_uploader"),
+            type=['xlsx', 'csv'],
+            accept_multiple_files=True,
+            key="batch_uploader"
+        )
+        if batch_files and st.button(get_translation("batch_generate"), key="batch_generate"):
+            from batch import run_batch, write_zip
+            progress = st.progress(0.0, text=get_translation("generating_pdf"))
+            
+            def on_result(done, total, result):
+                progress.progress(done / total, text=f"{done}/{total} - {result['file']}")
+            
+            results = run_batch(
+                [(f.name, f.getvalue()) for f in batch_files],
+                on_result=on_result
+            )
+            zip_buf = BytesIO()
+            write_zip(results, zip_buf)
+            
+            failed = sum(result['status'] != 'OK' for result in results)
+            st.markdown(f"""
+            <div class="success-message">
+                <strong>{get_translation("batch_done").format(ok=len(results) - failed, failed=failed)}</strong>
+            </div>
+            """, unsafe_allow_html=True)
+            st.dataframe(
+                [{key: result[key] for key in ('file', 'status', 'seconds', 'error')} for result in results],
+                width='stretch'
+            )
+            st.download_button(
+                label=get_translation("batch_download"),
+                data=zip_buf.getvalue(),
+                file_name=f"GridToDash_Reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                mime="application/zip",
+                type="primary"
+            )
 
 
 if __name__ == "__main__":
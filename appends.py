@@ -0,0 +1,90 @@
+"""
+Appended-file detection for GridToDash
+Remembers the CSV uploads that were loaded, so a new upload that is an
+earlier file plus rows added at the end can be recognized and only the new
+rows parsed. Excel files are zip archives, so appended rows change the
+whole file and they are always loaded in full.
+Uploads are given as bytes or as a binary file object, which is read in
+blocks instead of as a whole.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from dataset_cache import hash_content
+
+
+# Leading bytes hashed to find candidate earlier uploads quickly
+PROBE_BYTES = 64 * 1024
+
+# Uploads remembered (least recently used are forgotten first)
+MAX_ENTRIES = 256
+
+
+def _digest(data, length=None):
+    return hash_content(hashlib.blake2b(digest_size=20), data, length).digest()
+
+
+def _size(data):
+    if hasattr(data, 'read'):
+        return data.seek(0, os.SEEK_END)
+    return len(data)
+
+
+def _ends_line(data, length):
+    """True when the first length bytes of data end with a line break."""
+    if hasattr(data, 'read'):
+        data.seek(length - 1)
+        return data.read(1) == b'\n'
+    return data[length - 1] == ord('\n')
+
+
+class AppendIndex:
+    """Thread-safe index of loaded uploads by the hash of their first bytes."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, data, key, mode=None):
+        """Remember that data was loaded as dataset key (mode: how it was parsed)."""
+        size = _size(data)
+        if size <= PROBE_BYTES:
+            # Too small to be worth a delta load
+            return
+        entry = (size, _digest(data), mode)
+        with self._lock:
+            self._entries[key] = (_digest(data, PROBE_BYTES), entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def find(self, data, mode=None):
+        """
+        Return (key, length) of the longest earlier upload, parsed the same
+        way, whose bytes are a prefix of data ending at a line break, or None.
+        """
+        size = _size(data)
+        if size <= PROBE_BYTES:
+            return None
+        probe = _digest(data, PROBE_BYTES)
+        with self._lock:
+            candidates = [(entry, key) for key, (head, entry) in self._entries.items()
+                          if head == probe and entry[2] == mode and entry[0] < size]
+        for (length, digest, _), key in sorted(candidates, key=lambda item: -item[0][0]):
+            if _ends_line(data, length) and _digest(data, length) == digest:
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                return key, length
+        return None
+
+    def forget(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+APPEND_INDEX = AppendIndex()
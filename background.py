@@ -0,0 +1,105 @@
+"""
+Background loading for GridToDash
+Parses large uploads on a worker thread while the page already shows the
+preview. Jobs are shared by key, so reruns and other sessions waiting for
+the same file attach to the running parse instead of starting a new one.
+A job is cancelled once no session is waiting for it any more.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gridtodash-load")
+_JOBS = {}
+_LOCK = threading.Lock()
+
+
+class LoadJob:
+    """Progress and cancellation state of one background load."""
+
+    def __init__(self, key, size_bytes):
+        self.key = key
+        self.size_bytes = size_bytes
+        self.rows = 0
+        self.fraction = 0.0
+        self.started = time.monotonic()
+        self.owners = set()
+        self.future = None
+        self._cancelled = threading.Event()
+
+    def update(self, rows, fraction):
+        """Progress callback for the readers; stops the load once cancelled."""
+        if self._cancelled.is_set():
+            from pipeline import LoadCancelled
+            raise LoadCancelled(f"Load of {self.key} was cancelled")
+        self.rows = rows
+        if fraction is not None:
+            self.fraction = fraction
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def bytes_done(self):
+        return int(self.fraction * self.size_bytes)
+
+    @property
+    def eta_seconds(self):
+        """Estimated seconds left, or None before there is anything to go by."""
+        if self.fraction <= 0:
+            return None
+        elapsed = time.monotonic() - self.started
+        return elapsed * (1 - self.fraction) / self.fraction
+
+
+def load_in_background(uploaded_file, sheet_name, key, owner):
+    """
+    Start (or join) the full load of an upload and return its LoadJob.
+    owner identifies the session waiting for it. The worker gets its own
+    file object, so the script thread can keep reading the upload for the
+    preview.
+    """
+    # Imported here: release() runs before any upload and must not load pandas
+    from pipeline import MemoryFile, load_dataset
+    started = False
+    with _LOCK:
+        job = _JOBS.get(key)
+        if job is None or job.cancelled:
+            job = LoadJob(key, uploaded_file.size)
+            source = MemoryFile(uploaded_file.name, uploaded_file.getvalue())
+            job.future = _EXECUTOR.submit(load_dataset, source, sheet_name, key, job.update)
+            _JOBS[key] = job
+            started = True
+        job.owners.add(owner)
+    if started:
+        # Finished datasets live in the dataset cache; drop the job either way.
+        # Outside the lock: a load that already finished runs the callback right here
+        job.future.add_done_callback(lambda _, job=job: _forget(job))
+    return job
+
+
+def release(owner, keep=None):
+    """
+    Stop waiting for every load of this owner except the one for keep.
+    Loads nobody waits for any more are cancelled.
+    """
+    with _LOCK:
+        for key, job in list(_JOBS.items()):
+            if key == keep or owner not in job.owners:
+                continue
+            job.owners.discard(owner)
+            if not job.owners:
+                job.cancel()
+                del _JOBS[key]
+
+
+def _forget(job):
+    with _LOCK:
+        if _JOBS.get(job.key) is job:
+            del _JOBS[job.key]
@@ -0,0 +1,162 @@
+"""
+Batch report generation for GridToDash
+Builds reports for many files at once, spreading parse/chart/PDF work over a
+process pool, and packs the PDFs with a status sheet into one ZIP.
+"""
+
+import csv
+import io
+import os
+import time
+import tracemalloc
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pipeline import LocalFile, MemoryFile, build_report
+
+
+SUPPORTED_EXTENSIONS = ('.xlsx', '.csv')
+
+
+def available_cores():
+    """Cores this process may run on (respects container CPU affinity)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def collect_inputs(paths):
+    """Expand folders into the Excel/CSV files they contain, keeping the given order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return files
+
+
+def report_names(paths):
+    """
+    Name each PDF after its input file (sales.xlsx -> sales.pdf), adding a
+    counter when two inputs share a name (sales.csv -> sales-2.pdf).
+    """
+    names = []
+    used = set()
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name = f"{stem}.pdf"
+        counter = 2
+        while name in used:
+            name = f"{stem}-{counter}.pdf"
+            counter += 1
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _render_one(path, data, options, output_dir, report, trace_memory=False):
+    """
+    Worker: build one report. Runs in a separate process, so it only gets
+    picklable arguments and always returns a result dict instead of raising.
+    With trace_memory the peak of Python allocations while building it is
+    returned in result['peak_mb'] (tracing slows the build down).
+    """
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = {'file': os.path.basename(path), 'report': report, 'status': 'OK',
+              'error': '', 'output': None, 'pdf': None}
+    try:
+        # Files on disk are read from there, not loaded into memory first
+        with LocalFile(path) if data is None else MemoryFile(os.path.basename(path), data) as source:
+            if output_dir:
+                # Pages go straight to the file as they are finished
+                result['output'] = os.path.join(output_dir, report)
+                with open(result['output'], 'wb') as f:
+                    build_report(source, output=f, **options)
+            else:
+                result['pdf'] = build_report(source, **options)
+    except Exception as e:
+        result['status'] = 'FAIL'
+        result['error'] = str(e)
+        if result['output'] and os.path.exists(result['output']):
+            # Do not leave a half-written PDF behind
+            os.remove(result['output'])
+        result['output'] = None
+    result['seconds'] = round(time.perf_counter() - start, 2)
+    if trace_memory:
+        result['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+    return result
+
+
+def run_batch(inputs, options=None, max_workers=None, output_dir=None, on_result=None, trace_memory=False):
+    """
+    Build a report for every input and return the results in input order.
+    inputs are paths, or (name, bytes) pairs for uploaded files. With
+    output_dir the workers write the PDFs themselves; otherwise the PDF
+    bytes come back in result['pdf']. on_result(done, total, result) is
+    called as each file finishes. trace_memory adds each report's peak
+    memory (see _render_one).
+    """
+    options = options or {}
+    jobs = [(item, None) if isinstance(item, str) else item for item in inputs]
+    if max_workers is None:
+        max_workers = available_cores()
+    max_workers = max(1, min(max_workers, len(jobs)))
+
+    reports = report_names([path for path, _ in jobs])
+    results = [None] * len(jobs)
+    if max_workers == 1:
+        for i, (path, data) in enumerate(jobs):
+            results[i] = _render_one(path, data, options, output_dir, reports[i], trace_memory)
+            if on_result:
+                on_result(i + 1, len(jobs), results[i])
+        return results
+
+    # spawn: forking a process that runs Streamlit's threads is not safe
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = {
+            executor.submit(_render_one, path, data, options, output_dir, reports[i], trace_memory): i
+            for i, (path, data) in enumerate(jobs)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                # The worker process itself died
+                results[i] = {'file': os.path.basename(jobs[i][0]), 'report': reports[i],
+                              'status': 'FAIL', 'error': str(e), 'output': None, 'pdf': None,
+                              'seconds': 0}
+            if on_result:
+                on_result(done, len(jobs), results[i])
+    return results
+
+
+def write_zip(results, target):
+    """
+    Write the PDFs and a status.csv (file, status, seconds, report, error) into a ZIP.
+    target is a path or a writable binary file object.
+    """
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_STORED) as archive:
+        status = io.StringIO()
+        writer = csv.writer(status)
+        writer.writerow(['file', 'status', 'seconds', 'report', 'error'])
+        for result in results:
+            ok = result['status'] == 'OK'
+            writer.writerow([result['file'], result['status'], result['seconds'],
+                             result['report'] if ok else '', result['error']])
+            if not ok:
+                continue
+            # PDF streams are already deflated, so the ZIP just stores them
+            if result['pdf'] is not None:
+                archive.writestr(result['report'], result['pdf'])
+            else:
+                archive.write(result['output'], result['report'])
+        archive.writestr('status.csv', status.getvalue())
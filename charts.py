@@ -0,0 +1,347 @@
+"""
+Chart rendering for GridToDash
+Draws the report bar chart with Matplotlib's object-oriented Figure API on
+an Agg canvas. No pyplot state is involved, so Streamlit sessions can render
+charts on their own threads at the same time. Rendered PNGs are cached per
+dataset and chart settings. PDF reports draw the same chart as native
+vector graphics instead (draw_pdf_chart), and the app shows it as an
+interactive Vega-Lite chart drawn in the browser (interactive_chart).
+"""
+
+import math
+import os
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from dataset_cache import LRUCache
+from topk import top_k
+
+
+# Bar colors, one per charted column
+COLORS = ['#059669', '#0EA5E9', '#8B5CF6', '#F59E0B', '#EC4899']
+
+DPI = 150
+
+# Part of every cache key: change it when the look of the chart changes
+CHART_STYLE = ('bar', 1, DPI, tuple(COLORS))
+
+# Memory budget for rendered charts (PNGs and interactive chart data), in megabytes
+CHART_CACHE_MB = float(os.getenv("GRIDTODASH_CHART_CACHE_MB", "64"))
+
+CHART_CACHE = LRUCache(int(CHART_CACHE_MB * 1024 * 1024))
+
+# Most bars sent to the browser; longer series are downsampled
+INTERACTIVE_POINTS = int(os.getenv("GRIDTODASH_CHART_POINTS", "2000"))
+
+# Up to this many bars are drawn one per label, like the PNG
+LABELED_POINTS = 100
+
+
+def bar_chart_spec(df, x_axis_col, y_axis_col, numeric_cols, aggregation=None):
+    """
+    What the bar chart shows: the top entries by the Y-axis column, their
+    labels and one value array per charted column. Aggregated data (see
+    pipeline.chart_data) takes its labels from the index. The PNG and the
+    PDF renderers both draw from this.
+    """
+    # Limit to max 100 rows
+    max_rows = min(100, len(df))
+    top_data = top_k(df, max_rows, y_axis_col)
+
+    # Get labels from X-axis column
+    labels = (top_data.index if aggregation else top_data[x_axis_col]).astype(str).tolist()
+
+    if len(numeric_cols) > 1:
+        # Grouped bars for multiple columns (max 5)
+        series = [{'name': col, 'color': COLORS[i % len(COLORS)], 'edge': None,
+                   'values': top_data[col].to_numpy(dtype='float64', na_value=np.nan)}
+                  for i, col in enumerate(numeric_cols[:5])]
+        bar_width = 0.8 / len(numeric_cols)
+    else:
+        series = [{'name': y_axis_col, 'color': '#059669', 'edge': '#047857',
+                   'values': top_data[y_axis_col].to_numpy(dtype='float64', na_value=np.nan)}]
+        bar_width = 0.8
+
+    if aggregation:
+        title = f'{x_axis_col} by {aggregation} of {y_axis_col} ({len(top_data)} groups)'
+    else:
+        title = f'{x_axis_col} by {y_axis_col} ({len(top_data)} entries)'
+    return {
+        'labels': labels,
+        'series': series,
+        'bar_width': bar_width,
+        'legend': len(series) > 1,
+        'title': title,
+        'x_label': x_axis_col,
+        'y_label': y_axis_col,
+        'max_rows': max_rows
+    }
+
+
+def render_png(spec):
+    """Render a bar chart spec to a PNG in a BytesIO."""
+    positions = np.arange(len(spec['labels']))
+    width = spec['bar_width']
+
+    # Calculate dynamic figure size based on number of entries
+    fig_height = min(6 + (spec['max_rows'] / 20), 12)
+    fig = Figure(figsize=(12, fig_height))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    if spec['legend']:
+        for i, series in enumerate(spec['series']):
+            ax.bar(positions + i * width, series['values'], width, label=series['name'], color=series['color'])
+        ax.set_xticks(positions + width * (len(spec['series']) - 1) / 2)
+        ax.set_xticklabels(spec['labels'], rotation=45, ha='right', fontsize=9)
+        ax.legend(loc='upper right', fontsize=8)
+    else:
+        series = spec['series'][0]
+        ax.bar(positions, series['values'], color=series['color'], edgecolor=series['edge'])
+        ax.set_xticks(positions)
+        ax.set_xticklabels(spec['labels'], rotation=45, ha='right', fontsize=9)
+
+    ax.set_xlabel(spec['x_label'])
+    ax.set_ylabel(spec['y_label'])
+    ax.set_title(spec['title'], color='#1E3A5F', fontweight='bold')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.grid(axis='y', alpha=0.3)
+
+    buf = BytesIO()
+    fig.tight_layout()
+    fig.savefig(buf, format='png', dpi=DPI, bbox_inches='tight')
+    buf.seek(0)
+    return buf
+
+
+def generate_bar_chart(df, x_axis_col, y_axis_col, numeric_cols, aggregation=None):
+    """
+    Generate a bar chart showing top entries by value.
+    Uses selected column for X-axis labels and Y-axis values.
+    Returns the PNG in a BytesIO.
+    """
+    return render_png(bar_chart_spec(df, x_axis_col, y_axis_col, numeric_cols, aggregation))
+
+
+def _rgb(color):
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+
+
+def _nice_ticks(low, high, count=6):
+    """Round tick values covering low..high, like an axis locator."""
+    if high <= low:
+        high = low + 1
+    raw = (high - low) / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+    start = math.floor(low / step) * step
+    stop = math.ceil(high / step) * step
+    return [start + i * step for i in range(int(round((stop - start) / step)) + 1)], step
+
+
+def _tick_label(value, step):
+    decimals = max(0, -math.floor(math.log10(step))) if step < 1 else 0
+    return f"{value:,.{decimals}f}"
+
+
+def _pdf_text(text):
+    """Text as the PDF fonts can write it: characters outside Latin-1 become '?'."""
+    return str(text).encode('latin-1', errors='replace').decode('latin-1')
+
+
+def draw_pdf_chart(pdf, spec, x=10, width=190, height=None):
+    """
+    Draw a bar chart spec as vector graphics on the current PDF page:
+    bars, axes, grid, tick labels, titles and legend. Starts at the current
+    y position (on a new page if it does not fit) and moves below the chart.
+    """
+    labels = [_pdf_text(label) for label in spec['labels']]
+    title, x_label, y_label = (_pdf_text(spec[key]) for key in ('title', 'x_label', 'y_label'))
+    if height is None:
+        height = min(90 + len(labels) * 0.6, 150)
+    if pdf.get_y() + height > pdf.page_break_trigger:
+        pdf.add_page()
+    top = pdf.get_y()
+
+    values = np.concatenate([series['values'] for series in spec['series']]) if labels else np.zeros(1)
+    values = values[~np.isnan(values)]
+    low = min(0.0, float(values.min())) if len(values) else 0.0
+    high = max(0.0, float(values.max())) if len(values) else 1.0
+    ticks, step = _nice_ticks(low, high)
+    low, high = ticks[0], ticks[-1]
+
+    # Plot area: room for the title above, tick and axis labels around
+    label_size = max(4, min(7, 400 / max(len(labels), 1)))
+    pdf.set_font('Arial', '', label_size)
+    longest = max((pdf.get_string_width(label[:30]) for label in labels), default=0)
+    pdf.set_font('Arial', '', 7)
+    tick_width = max(pdf.get_string_width(_tick_label(tick, step)) for tick in ticks)
+    left = x + tick_width + 8
+    right = x + width - 2
+    plot_top = top + 10
+    plot_bottom = top + height - 10 - longest * 0.71
+    plot_width = right - left
+    plot_height = plot_bottom - plot_top
+
+    def to_y(value):
+        return plot_bottom - (value - low) / (high - low) * plot_height
+
+    # Title
+    pdf.set_font('Arial', 'B', 10)
+    pdf.set_text_color(*_rgb('#1E3A5F'))
+    pdf.text(x + (width - pdf.get_string_width(title)) / 2, top + 5, title)
+
+    # Grid and y tick labels
+    pdf.set_font('Arial', '', 7)
+    pdf.set_text_color(60, 60, 60)
+    pdf.set_line_width(0.1)
+    pdf.set_draw_color(220, 220, 220)
+    for tick in ticks:
+        y = to_y(tick)
+        pdf.line(left, y, right, y)
+        text = _tick_label(tick, step)
+        pdf.text(left - pdf.get_string_width(text) - 1.5, y + 1, text)
+
+    # Bars: one slot per label, series side by side like the PNG
+    slot = plot_width / max(len(labels), 1)
+    bar_width = spec['bar_width'] * slot
+    zero = to_y(0.0)
+    for i, series in enumerate(spec['series']):
+        pdf.set_fill_color(*_rgb(series['color']))
+        style = 'F'
+        if series['edge']:
+            pdf.set_draw_color(*_rgb(series['edge']))
+            style = 'DF'
+        offset = (0.1 + i * spec['bar_width']) * slot if spec['legend'] else 0.1 * slot
+        for j, value in enumerate(series['values']):
+            if np.isnan(value):
+                continue
+            y = to_y(value)
+            pdf.rect(left + j * slot + offset, min(y, zero), bar_width, abs(zero - y), style)
+
+    # Axes
+    pdf.set_draw_color(60, 60, 60)
+    pdf.set_line_width(0.2)
+    pdf.line(left, plot_top, left, plot_bottom)
+    pdf.line(left, plot_bottom, right, plot_bottom)
+    if low < 0:
+        pdf.line(left, zero, right, zero)
+
+    # X labels, rotated 45 degrees and ending under their bar group
+    pdf.set_font('Arial', '', label_size)
+    group = spec['bar_width'] * (len(spec['series']) if spec['legend'] else 1)
+    for j, label in enumerate(labels):
+        label = label[:30]
+        tick_x = left + j * slot + 0.1 * slot + group * slot / 2
+        tick_y = plot_bottom + 2
+        pdf.rotate(45, tick_x, tick_y)
+        pdf.text(tick_x - pdf.get_string_width(label), tick_y + label_size * 0.15, label)
+        pdf.rotate(0)
+
+    # Axis titles
+    pdf.set_font('Arial', '', 8)
+    pdf.text(left + (plot_width - pdf.get_string_width(x_label)) / 2, top + height - 2, x_label)
+    label_x, label_y = x + 3, plot_top + (plot_height + pdf.get_string_width(y_label)) / 2
+    pdf.rotate(90, label_x, label_y)
+    pdf.text(label_x, label_y, y_label)
+    pdf.rotate(0)
+
+    # Legend, top right
+    if spec['legend']:
+        pdf.set_font('Arial', '', 7)
+        legend_y = plot_top + 1
+        for series in spec['series']:
+            name = _pdf_text(series['name'])
+            text_width = pdf.get_string_width(name)
+            pdf.set_fill_color(*_rgb(series['color']))
+            pdf.rect(right - text_width - 6, legend_y, 3, 2.5, 'F')
+            pdf.text(right - text_width - 2, legend_y + 2.2, name)
+            legend_y += 4
+
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_draw_color(0, 0, 0)
+    pdf.set_line_width(0.2)
+    pdf.set_xy(pdf.l_margin, top + height)
+
+
+def bucket_max(values, max_points):
+    """
+    Positions to keep when a series is downsampled to at most max_points:
+    consecutive values are cut into equal buckets and each bucket keeps its
+    largest value by magnitude, so peaks and dips survive. Buckets with
+    only missing values are left out.
+    """
+    count = len(values)
+    if count <= max_points:
+        return np.arange(count)
+    size = math.ceil(count / max_points)
+    buckets = math.ceil(count / size)
+    magnitude = np.full(buckets * size, -np.inf)
+    magnitude[:count] = np.abs(values)
+    magnitude[np.isnan(magnitude)] = -np.inf
+    keep = magnitude.reshape(buckets, size).argmax(axis=1) + np.arange(buckets) * size
+    return keep[np.isfinite(magnitude[keep])]
+
+
+def interactive_chart(df, x_axis_col, y_axis_col, numeric_cols, aggregation=None,
+                      max_points=INTERACTIVE_POINTS):
+    """
+    Bar chart for the browser: {'data': long-form DataFrame, 'spec':
+    Vega-Lite spec, 'rows': rows charted, 'points': bars sent}. Raw rows
+    are the same top entries by the Y-axis column as in the PNG and the
+    PDF; groups of aggregated data all stay, in group order. Up to
+    LABELED_POINTS bars are labeled and grouped by column like the PNG;
+    longer series show the Y-axis column only, downsampled with
+    bucket_max, on a zoomable axis.
+    """
+    if not aggregation:
+        df = top_k(df, min(100, len(df)), y_axis_col)
+    labels = (df.index if aggregation else df[x_axis_col]).astype(str).to_numpy(dtype=object)
+    names = list(numeric_cols[:5]) if len(numeric_cols) > 1 else [y_axis_col]
+    values = df[y_axis_col].to_numpy(dtype='float64', na_value=np.nan)
+    keep = bucket_max(values, max_points)
+    labeled = len(df) <= LABELED_POINTS
+    if not labeled:
+        names = [y_axis_col]
+
+    colors = [COLORS[i % len(COLORS)] for i in range(len(names))] if len(names) > 1 else ['#059669']
+    data = pd.DataFrame({
+        'position': np.tile(keep, len(names)),
+        'label': np.tile(labels[keep], len(names)),
+        'series': np.repeat(names, len(keep)),
+        'value': np.concatenate([df[name].to_numpy(dtype='float64', na_value=np.nan)[keep] for name in names])
+    })
+
+    if aggregation:
+        title = f'{x_axis_col} by {aggregation} of {y_axis_col} ({len(df):,} groups)'
+    else:
+        title = f'{x_axis_col} by {y_axis_col} ({len(df):,} entries)'
+    if len(keep) < len(df):
+        title += f', {len(keep):,} bars shown'
+
+    encoding = {
+        'y': {'field': 'value', 'type': 'quantitative', 'title': y_axis_col},
+        'color': {'field': 'series', 'type': 'nominal', 'title': None,
+                  'scale': {'domain': names, 'range': colors}, 'legend': None if len(names) == 1 else {}},
+        'tooltip': [{'field': 'label', 'type': 'nominal', 'title': x_axis_col},
+                    {'field': 'series', 'type': 'nominal', 'title': 'Column'},
+                    {'field': 'value', 'type': 'quantitative', 'title': 'Value', 'format': ',.2f'}]
+    }
+    spec = {'title': title, 'mark': {'type': 'bar'}, 'encoding': encoding}
+    if labeled:
+        encoding['x'] = {'field': 'label', 'type': 'nominal', 'sort': None, 'title': x_axis_col,
+                         'axis': {'labelAngle': -45}}
+        if len(names) > 1:
+            encoding['xOffset'] = {'field': 'series', 'sort': names}
+    else:
+        # Bars at their row position; drag to pan and scroll to zoom, in the browser
+        encoding['x'] = {'field': 'position', 'type': 'quantitative', 'title': x_axis_col,
+                         'axis': {'labels': False, 'ticks': False}}
+        spec['params'] = [{'name': 'zoom', 'select': {'type': 'interval', 'encodings': ['x']},
+                           'bind': 'scales'}]
+    return {'data': data, 'spec': spec, 'rows': len(df), 'points': len(keep)}
@@ -0,0 +1,86 @@
+"""
+Command line entry point for GridToDash
+Turns Excel/CSV files into PDF reports without starting Streamlit.
+
+Usage:
+    python cli.py sales.xlsx stock.csv -o reports/
+    python cli.py sales.xlsx --metric Vendas --x-axis Artigo --columns Artigo,Vendas
+    python cli.py invoices.csv --x-axis Cliente --y-axis Valor --aggregate sum
+    python cli.py branches/ --zip month_end.zip --jobs 8
+    python cli.py ledger.csv --full-table
+    python cli.py ledger.csv --full-table --trace-memory
+"""
+
+import argparse
+import os
+import sys
+
+from aggregation import AGGREGATIONS
+from batch import available_cores, collect_inputs, run_batch, write_zip
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="gridtodash",
+        description="Generate GridToDash PDF reports from Excel/CSV files."
+    )
+    parser.add_argument("files", nargs="+", help="Excel (.xlsx) or CSV files, or folders containing them")
+    parser.add_argument("-o", "--output-dir", default=".", help="Folder for the PDF reports (default: current folder)")
+    parser.add_argument("--zip", help="Write all PDFs plus status.csv into this ZIP file instead of the output folder")
+    parser.add_argument("-j", "--jobs", type=int, default=available_cores(),
+                        help="Worker processes (default: available cores)")
+    parser.add_argument("--sheet", help="Excel sheet to read (default: first sheet)")
+    parser.add_argument("--metric", help="Numeric column for Total Sum and Average (default: first numeric column that is not an ID)")
+    parser.add_argument("--x-axis", help="Column for the chart labels (default: first text column)")
+    parser.add_argument("--y-axis", help="Numeric column for the chart values (default: metrics column)")
+    parser.add_argument("--aggregate", choices=AGGREGATIONS,
+                        help="Group the chart by the X-axis column (default: one bar per row)")
+    parser.add_argument("--columns", help="Comma-separated columns to include in the PDF (default: all)")
+    parser.add_argument("--full-table", action="store_true",
+                        help="Write every row into the PDF data table (default: first 100 rows)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Report the peak memory of building each PDF (slower)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = collect_inputs(args.files)
+    if not files:
+        print("No Excel/CSV files found.", file=sys.stderr)
+        return 1
+    options = {
+        'sheet_name': args.sheet,
+        'metric_col': args.metric,
+        'x_axis_col': args.x_axis,
+        'y_axis_col': args.y_axis,
+        'aggregation': args.aggregate,
+        'pdf_columns': [col.strip() for col in args.columns.split(",")] if args.columns else None,
+        'full_table': args.full_table
+    }
+    
+    output_dir = None
+    if not args.zip:
+        output_dir = args.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+
+    def report(done, total, result):
+        target = result['output'] or result['report']
+        if result['status'] == 'OK':
+            peak = f", peak {result['peak_mb']:.1f} MB" if 'peak_mb' in result else ""
+            print(f"[{done}/{total}] OK    {result['file']} -> {target} ({result['seconds']:.2f}s{peak})")
+        else:
+            print(f"[{done}/{total}] FAIL  {result['file']}: {result['error']}", file=sys.stderr)
+
+    results = run_batch(files, options, max_workers=args.jobs, output_dir=output_dir, on_result=report,
+                        trace_memory=args.trace_memory)
+    if args.zip:
+        write_zip(results, args.zip)
+        print(f"Wrote {args.zip}")
+
+    failures = sum(result['status'] != 'OK' for result in results)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
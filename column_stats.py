@@ -0,0 +1,130 @@
+"""
+Column statistics for GridToDash
+Computes count, sum, mean, min, max, standard deviation and null counts for
+every numeric column at once. Rows are processed in blocks, so the same
+accumulator serves in-memory DataFrames and chunked CSV streams.
+"""
+
+import numpy as np
+
+
+# Rows per block when scanning an in-memory DataFrame
+BLOCK_ROWS = 65536
+
+
+class ColumnStats:
+    """
+    Running statistics for a set of numeric columns.
+    Each update() handles one block of rows for all columns in a single
+    vectorized pass; blocks are merged with Chan's parallel variance formula.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.rows = 0
+        self.count = np.zeros(k, dtype=np.int64)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.total = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+        # Integer columns also keep an exact sum, like pandas does
+        self.int_total = {}
+
+    def update(self, frame):
+        """Add a block of rows (a DataFrame holding at least the tracked columns)."""
+        n = len(frame)
+        if n == 0 or not self.columns:
+            self.rows += n
+            return
+        block = np.empty((n, len(self.columns)))
+        for j, col in enumerate(self.columns):
+            series = frame[col]
+            exact = self.int_total.get(col, 0)
+            if exact is not None and isinstance(series.dtype, np.dtype) and series.dtype.kind in 'iu':
+                self.int_total[col] = exact + int(series.to_numpy().sum(dtype=np.int64))
+            else:
+                # A float (or nullable) block anywhere means no exact sum
+                self.int_total[col] = None
+            block[:, j] = series.to_numpy(dtype='float64', na_value=np.nan)
+
+        valid = ~np.isnan(block)
+        count = valid.sum(axis=0)
+        total = np.where(valid, block, 0.0).sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, total / count, 0.0)
+        m2 = np.square(np.where(valid, block - mean, 0.0)).sum(axis=0)
+        self._merge(count, mean, m2, total,
+                    np.where(valid, block, np.inf).min(axis=0),
+                    np.where(valid, block, -np.inf).max(axis=0))
+        self.rows += n
+
+    def _merge(self, count, mean, m2, total, minimum, maximum):
+        merged = self.count + count
+        delta = mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.mean = np.where(merged > 0, self.mean + delta * count / merged, 0.0)
+            self.m2 = self.m2 + m2 + np.where(merged > 0, delta ** 2 * self.count * count / merged, 0.0)
+        self.count = merged
+        self.total += total
+        self.min = np.minimum(self.min, minimum)
+        self.max = np.maximum(self.max, maximum)
+
+    @classmethod
+    def from_result(cls, column_stats, rows):
+        """Rebuild the running state from a result() dict, e.g. to add appended rows."""
+        stats = cls(column_stats)
+        for j, col in enumerate(stats.columns):
+            entry = column_stats[col]
+            count = entry['count']
+            stats.count[j] = count
+            stats.total[j] = entry['sum']
+            if count:
+                stats.mean[j] = entry['mean']
+                stats.min[j] = entry['min']
+                stats.max[j] = entry['max']
+            if count > 1:
+                stats.m2[j] = entry['std'] ** 2 * (count - 1)
+            stats.int_total[col] = entry['sum'] if isinstance(entry['sum'], int) else None
+        stats.rows = rows
+        return stats
+
+    def drop(self, columns):
+        """Stop tracking columns (e.g. a streamed column turned out to hold text)."""
+        keep = [j for j, col in enumerate(self.columns) if col not in columns]
+        for name in ('count', 'mean', 'm2', 'total', 'min', 'max'):
+            setattr(self, name, getattr(self, name)[keep])
+        self.columns = [self.columns[j] for j in keep]
+        for col in columns:
+            self.int_total.pop(col, None)
+
+    def result(self):
+        """Return {column: {count, nulls, sum, mean, min, max, std}}."""
+        stats = {}
+        for j, col in enumerate(self.columns):
+            count = int(self.count[j])
+            exact = self.int_total.get(col)
+            stats[col] = {
+                'count': count,
+                'nulls': self.rows - count,
+                'sum': exact if exact is not None else float(self.total[j]),
+                'mean': float(self.mean[j]) if count else float('nan'),
+                'min': float(self.min[j]) if count else float('nan'),
+                'max': float(self.max[j]) if count else float('nan'),
+                'std': float(np.sqrt(self.m2[j] / (count - 1))) if count > 1 else float('nan')
+            }
+        return stats
+
+
+def compute_summary(df, numeric_cols, block_rows=BLOCK_ROWS):
+    """
+    Statistics for every numeric column of an in-memory DataFrame.
+    Returns {'total_records': rows, 'column_stats': {column: stats}}, the
+    same shape the chunked CSV reader produces.
+    """
+    stats = ColumnStats(numeric_cols)
+    for start in range(0, len(df), block_rows):
+        stats.update(df.iloc[start:start + block_rows])
+    stats.rows = len(df)
+    return {'total_records': len(df), 'column_stats': stats.result()}
@@ -0,0 +1,207 @@
+"""
+On-disk columnar store for GridToDash
+Saves parsed datasets as one .npy file per column plus a small schema, keyed
+by the dataset content hash. Reloads memory-map the files, so reopening the
+same workbook skips parsing and numeric and date columns are only paged in
+from disk as they are read. Text columns are rebuilt from their codes and
+labels in full on every open (about 0.6s per 2M rows).
+"""
+
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+
+# Where datasets are stored; set to an empty string to disable the store
+STORE_DIR = os.getenv("GRIDTODASH_STORE_DIR", ".gridtodash_store")
+
+# Disk budget for the store, in megabytes; least recently opened datasets go first
+STORE_MAX_MB = float(os.getenv("GRIDTODASH_STORE_MAX_MB", "2048"))
+
+SCHEMA_VERSION = 2
+
+
+def _dataset_dir(key):
+    return os.path.join(STORE_DIR, key)
+
+
+def _is_numpy_native(dtype):
+    """True for dtypes that np.save can write and np.load can memory-map."""
+    return isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM'
+
+
+def _save_labels(path, labels):
+    """
+    Save category labels: numeric labels as .npy, strings as JSON, and
+    anything else (mixed types, timestamps with a time zone) pickled, so the
+    labels come back as they were parsed.
+    """
+    labels = pd.Index(labels)
+    if _is_numpy_native(labels.dtype):
+        np.save(path + '.npy', labels.to_numpy())
+        return 'npy'
+    if all(isinstance(label, str) for label in labels):
+        with open(path + '.json', 'w', encoding='utf-8') as f:
+            json.dump(list(labels), f, ensure_ascii=False)
+        return 'json'
+    np.save(path + '.npy', labels.to_numpy(dtype=object), allow_pickle=True)
+    return 'pickle'
+
+
+def _load_labels(path, fmt):
+    if fmt == 'npy':
+        return np.load(path + '.npy')
+    if fmt == 'pickle':
+        return np.load(path + '.npy', allow_pickle=True)
+    with open(path + '.json', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_dataset(key, df):
+    """
+    Write a DataFrame to the store under the given key.
+    Numeric and date columns are saved as raw arrays, dates with a time zone
+    as int64 plus the zone; text columns are saved as integer codes plus
+    their distinct labels; df.attrs go into the schema.
+    Returns the dataset directory, or None when the store is disabled.
+    """
+    if not STORE_DIR:
+        return None
+    target = _dataset_dir(key)
+    if os.path.exists(os.path.join(target, 'schema.json')):
+        return target
+
+    os.makedirs(STORE_DIR, exist_ok=True)
+    tmp = os.path.join(STORE_DIR, f".tmp-{uuid.uuid4().hex}")
+    os.makedirs(tmp)
+    try:
+        columns = []
+        for i, (name, series) in enumerate(df.items()):
+            base = os.path.join(tmp, str(i))
+            entry = {'name': str(name), 'dtype': str(series.dtype)}
+            if _is_numpy_native(series.dtype):
+                np.save(base + '.npy', series.to_numpy())
+                entry['kind'] = 'array'
+            elif isinstance(series.dtype, pd.DatetimeTZDtype):
+                np.save(base + '.npy', series.array.asi8)
+                entry['kind'] = 'datetimetz'
+                entry['unit'] = series.dtype.unit
+                entry['tz'] = str(series.dtype.tz)
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                np.save(base + '.npy', series.cat.codes.to_numpy())
+                entry['kind'] = 'category'
+                entry['labels'] = _save_labels(base + '.labels', series.cat.categories)
+                entry['ordered'] = bool(series.cat.ordered)
+            elif pd.api.types.is_numeric_dtype(series.dtype):
+                # Nullable extension numbers (Int64, Float64, boolean) are stored as floats
+                np.save(base + '.npy', series.to_numpy(dtype='float64', na_value=np.nan))
+                entry['kind'] = 'array'
+            else:
+                codes, uniques = pd.factorize(series)
+                np.save(base + '.npy', codes.astype(np.int32))
+                entry['kind'] = 'text'
+                entry['labels'] = _save_labels(base + '.labels', uniques)
+            entry['file'] = f"{i}.npy"
+            columns.append(entry)
+
+        schema = {'version': SCHEMA_VERSION, 'rows': len(df), 'columns': columns, 'attrs': df.attrs}
+        with open(os.path.join(tmp, 'schema.json'), 'w', encoding='utf-8') as f:
+            json.dump(schema, f, ensure_ascii=False)
+        os.replace(tmp, target)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.exists(os.path.join(target, 'schema.json')):
+            raise
+    prune_store()
+    return target
+
+
+def _load_column(directory, entry):
+    base = os.path.join(directory, entry['file'][:-len('.npy')])
+    # Plain ndarray view: still backed by the mapping, without the memmap subclass
+    values = np.load(os.path.join(directory, entry['file']), mmap_mode='r').view(np.ndarray)
+    if entry['kind'] == 'array':
+        return values
+    if entry['kind'] == 'datetimetz':
+        # Stored as UTC ticks; NaT is the int64 minimum and survives the view
+        dates = pd.DatetimeIndex(values.view(f"M8[{entry['unit']}]"))
+        return dates.tz_localize('UTC').tz_convert(entry['tz']).array
+    labels = _load_labels(base + '.labels', entry['labels'])
+    if entry['kind'] == 'category':
+        return pd.Categorical.from_codes(values, categories=labels, ordered=entry['ordered'])
+    codes = np.asarray(values)
+    if len(labels):
+        # Filled element by element so tuple labels are not split into columns
+        uniques = np.empty(len(labels), dtype=object)
+        uniques[:] = list(labels)
+        column = uniques.take(codes, mode='clip')
+        column[codes < 0] = None
+    else:
+        column = np.full(len(codes), None, dtype=object)
+    return pd.array(column, dtype=entry['dtype'] if entry['dtype'] in ('str', 'string') else object)
+
+
+def open_dataset(key):
+    """
+    Open a stored dataset, or return None when it is not in the store.
+    Numeric and date columns stay memory-mapped and read-only; text
+    columns are rebuilt in memory.
+    """
+    if not STORE_DIR:
+        return None
+    directory = _dataset_dir(key)
+    try:
+        with open(os.path.join(directory, 'schema.json'), encoding='utf-8') as f:
+            schema = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if schema.get('version') != SCHEMA_VERSION:
+        return None
+
+    data = {}
+    for entry in schema['columns']:
+        data[entry['name']] = _load_column(directory, entry)
+
+    # Mark as recently used for pruning
+    os.utime(directory)
+    df = pd.DataFrame(data, index=pd.RangeIndex(schema['rows']), copy=False)
+    df.attrs = schema.get('attrs', {})
+    return df
+
+
+def _dir_size(directory):
+    total = 0
+    for entry in os.scandir(directory):
+        if entry.is_file():
+            total += entry.stat().st_size
+    return total
+
+
+def prune_store(max_bytes=None):
+    """Delete the least recently used datasets until the store fits its budget."""
+    if not STORE_DIR or not os.path.isdir(STORE_DIR):
+        return
+    if max_bytes is None:
+        max_bytes = STORE_MAX_MB * 1024 * 1024
+
+    datasets = []
+    for entry in os.scandir(STORE_DIR):
+        if entry.is_dir() and not entry.name.startswith('.tmp-'):
+            datasets.append((entry.stat().st_mtime, _dir_size(entry.path), entry.path))
+    total = sum(size for _, size, _ in datasets)
+    for _, size, path in sorted(datasets):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+    # Leftovers from interrupted writes
+    cutoff = time.time() - 3600
+    for entry in os.scandir(STORE_DIR):
+        if entry.name.startswith('.tmp-') and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
@@ -0,0 +1,76 @@
+"""
+Dtype compaction for GridToDash
+Shrinks freshly loaded DataFrames: repeated text becomes categorical and
+integers are stored in the smallest dtype that keeps every value exact.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Text columns become categorical when distinct values / rows is at most this
+CATEGORY_MAX_RATIO = 0.5
+
+
+def _compact_column(series, category_max_ratio):
+    """Return a smaller but equivalent version of the column, or the column itself."""
+    dtype = series.dtype
+
+    if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+        return series
+
+    if pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+        # Sums and means of small ints are still accumulated in 64 bits
+        return pd.to_numeric(series, downcast='integer')
+
+    # Floats stay float64: pandas sums float32 columns in float32, which would
+    # change the totals shown in the metrics and the PDF
+    if pd.api.types.is_float_dtype(dtype):
+        return series
+
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        if len(series) and series.nunique(dropna=True) <= category_max_ratio * len(series):
+            return series.astype('category')
+    return series
+
+
+def compact_dtypes(df, category_max_ratio=CATEGORY_MAX_RATIO):
+    """
+    Compact column dtypes without losing information (attrs included).
+    Returns the compacted DataFrame and the number of bytes saved.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    compacted = pd.DataFrame(
+        {name: _compact_column(series, category_max_ratio) for name, series in df.items()},
+        index=df.index
+    )
+    compacted.attrs = dict(df.attrs)
+    after = int(compacted.memory_usage(deep=True).sum())
+    return compacted, before - after
+
+
+def compact_like(df, reference):
+    """
+    Compact rows that will be appended to reference, an already compacted
+    DataFrame with the same columns: each column follows the reference
+    dtype instead of being decided again over all rows. Categorical
+    reference columns get the new labels added to their categories.
+    Returns the compacted rows and the reference with widened categories.
+    """
+    columns = {}
+    widened = {}
+    for name, series in df.items():
+        dtype = reference[name].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and not isinstance(series.dtype, pd.CategoricalDtype):
+            new_labels = pd.Index(series.dropna().unique()).difference(dtype.categories)
+            if len(new_labels):
+                widened[name] = reference[name].cat.add_categories(new_labels)
+                dtype = widened[name].dtype
+            series = series.astype(dtype)
+        elif pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+            # pd.concat widens the reference dtype if the new values need it
+            series = _compact_column(series, 0)
+        columns[name] = series
+    if widened:
+        reference = reference.assign(**widened)
+    return pd.DataFrame(columns, index=df.index), reference
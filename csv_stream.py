@@ -0,0 +1,151 @@
+"""
+Chunked CSV ingestion for GridToDash
+Reads large CSV files in bounded chunks and keeps only what the report
+needs: per-column statistics and profile, the first rows for the
+preview/table and the top rows for the bar chart.
+"""
+
+import copy
+import os
+
+import pandas as pd
+
+from column_stats import ColumnStats
+from profiling import DatasetProfiler
+from topk import TopK
+from numeric_parsing import convert_if_numeric, detect_numeric_text
+
+
+# CSV uploads above this size (in megabytes) are streamed instead of fully loaded
+STREAMING_THRESHOLD_MB = float(os.getenv("GRIDTODASH_STREAMING_MB", "50"))
+
+# Rows per chunk while streaming
+CHUNK_ROWS = int(os.getenv("GRIDTODASH_CHUNK_ROWS", "100000"))
+
+
+def should_stream(size_bytes):
+    """Return True when a CSV of this size should be read in chunks."""
+    return size_bytes > STREAMING_THRESHOLD_MB * 1024 * 1024
+
+
+def read_fraction(source):
+    """Share of a file object already consumed by the parser, or None if unknown."""
+    try:
+        size = len(source.getbuffer()) if hasattr(source, 'getbuffer') else os.fstat(source.fileno()).st_size
+        return min(1.0, source.tell() / size) if size else None
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _top_rows(selectors):
+    """
+    Union of the top-N rows of every numeric column, in file order.
+    Rows are identified by their global position, so a row that is in the
+    top N for several columns is stored only once.
+    """
+    parts = [selector.result() for selector in selectors.values() if selector.result() is not None]
+    if not parts:
+        return None
+    merged = pd.concat(parts)
+    return merged[~merged.index.duplicated()].sort_index()
+
+
+def stream_csv(source, chunk_rows=CHUNK_ROWS, top_n=100, preview_rows=100, progress=None,
+               resume=None):
+    """
+    Read a CSV in chunks and accumulate the report summary in one pass.
+    Returns a dict with the row count, per-column statistics (count, nulls,
+    sum, mean, min, max, std), the column profiler (see profiling.py), the
+    first rows of the file, the candidate rows for the top-N bar chart and
+    the numeric text formats found (so the file can be re-read the same way).
+    text_columns lists the columns that looked like numbers at the top of
+    the file but hold text further down; they are read as text.
+    progress(rows, fraction) is called after every chunk.
+    resume is the result of an earlier stream_csv() over the start of the
+    same file; source then only holds the rows appended since (no header),
+    and they are folded into that result.
+    """
+    total_records = 0
+    columns = None
+    numeric_cols = None
+    stats = None
+    profiler = DatasetProfiler()
+    head = None
+    top = {}
+    text_formats = {}
+    text_columns = []
+    names = None
+    if resume is not None:
+        total_records = resume['total_records']
+        columns = names = resume['columns']
+        numeric_cols = list(resume['numeric_cols'])
+        stats = ColumnStats.from_result(resume['column_stats'], total_records)
+        # The cached result stays as it was: work on a copy of its sketches
+        profiler = copy.deepcopy(resume['profiler'])
+        head = resume['head']
+        # The kept candidates hold the top N of every column
+        for col in numeric_cols:
+            top[col] = TopK(top_n, col)
+            top[col].update(resume['top_rows'], positions=resume['top_rows'].index.to_numpy())
+        text_formats = dict(resume['text_formats'])
+        text_columns = list(resume['text_columns'])
+
+    for chunk in pd.read_csv(source, chunksize=chunk_rows, header=None if names else 'infer', names=names):
+        # Rows are identified by their position in the whole file
+        chunk.index = pd.RangeIndex(total_records, total_records + len(chunk))
+        if columns is None:
+            # Numbers written as text ("1.234,56") are detected on the first chunk
+            text_formats = detect_numeric_text(chunk)
+        # Every chunk is checked: the sample only saw the top of the file
+        for col, decimal in list(text_formats.items()):
+            numbers = convert_if_numeric(chunk[col], decimal)
+            if numbers is None:
+                # Left as text, so the column stops being numeric below
+                del text_formats[col]
+                text_columns.append(col)
+            else:
+                chunk[col] = numbers
+
+        if columns is None:
+            columns = chunk.columns.tolist()
+            numeric_cols = chunk.select_dtypes(include=['number']).columns.tolist()
+            stats = ColumnStats(numeric_cols)
+            top = {col: TopK(top_n, col) for col in numeric_cols}
+
+        # A column with text in a later chunk is not numeric for the whole file
+        chunk_numeric = set(chunk.select_dtypes(include=['number']).columns)
+        dropped = [col for col in numeric_cols if col not in chunk_numeric]
+        if dropped:
+            numeric_cols = [col for col in numeric_cols if col in chunk_numeric]
+            stats.drop(dropped)
+            for col in dropped:
+                del top[col]
+
+        stats.update(chunk)
+        profiler.update(chunk)
+
+        if head is None or len(head) < preview_rows:
+            needed = preview_rows - (0 if head is None else len(head))
+            head = chunk.head(needed) if head is None else pd.concat([head, chunk.head(needed)])
+
+        for selector in top.values():
+            selector.update(chunk, positions=chunk.index.to_numpy())
+        total_records += len(chunk)
+        if progress:
+            progress(total_records, read_fraction(source))
+
+    if columns is None or total_records == 0:
+        raise ValueError("The uploaded file is empty.")
+
+    candidates = _top_rows(top)
+    return {
+        'total_records': total_records,
+        'columns': columns,
+        'numeric_cols': numeric_cols,
+        'column_stats': stats.result(),
+        'profiler': profiler,
+        'text_formats': text_formats,
+        'text_columns': text_columns,
+        'head': head,
+        'top_rows': candidates if candidates is not None else head.iloc[0:0]
+    }
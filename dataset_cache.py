@@ -0,0 +1,135 @@
+"""
+In-memory cache for GridToDash
+Keeps parsed uploads alive across Streamlit reruns so a widget change
+does not re-parse the whole file.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+# Memory budget for parsed datasets, in megabytes (shared by all sessions)
+CACHE_MAX_MB = float(os.getenv("GRIDTODASH_CACHE_MB", "512"))
+
+# Bytes read at a time when hashing a file object
+HASH_BLOCK_BYTES = 1 << 20
+
+
+def hash_content(digest, data, length=None):
+    """
+    Feed data to a hashlib digest and return it: bytes, or a binary file
+    object read from the start in blocks, so a file on disk is never held
+    in memory as a whole. With length only the first length bytes count.
+    """
+    if not hasattr(data, 'read'):
+        digest.update(memoryview(data)[:length])
+        return digest
+    data.seek(0)
+    remaining = length
+    while remaining is None or remaining > 0:
+        block = data.read(HASH_BLOCK_BYTES if remaining is None else min(HASH_BLOCK_BYTES, remaining))
+        if not block:
+            break
+        digest.update(block)
+        if remaining is not None:
+            remaining -= len(block)
+    return digest
+
+
+def dataset_key(data, **options):
+    """
+    Build a cache key from the uploaded bytes (or a file object, see
+    hash_content) and the parse options.
+    The same file parsed with different options gets a different key.
+    """
+    digest = hash_content(hashlib.blake2b(digest_size=20), data)
+    for name in sorted(options):
+        digest.update(f"|{name}={options[name]!r}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def estimate_size(value):
+    """Estimate how many bytes a cached value keeps alive."""
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if hasattr(value, "memory_usage"):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    return 64
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by the estimated size of its values."""
+
+    def __init__(self, max_bytes, sizeof=estimate_size):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._total -= self._sizes.pop(key)
+                del self._entries[key]
+            if size > self.max_bytes:
+                # Too big to ever fit - keep the cache as it is
+                return value
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._total += size
+            while self._total > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self._total -= self._sizes.pop(old_key)
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._total -= self._sizes.pop(key)
+            return self._entries.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        return self._total
+
+
+# Module-level instance survives reruns because Streamlit only re-executes app.py
+DATASET_CACHE = LRUCache(int(CACHE_MAX_MB * 1024 * 1024))
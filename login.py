@@ -8,7 +8,7 @@ import os
 import base64
 import hashlib
 import secrets
-from pymongo import MongoClient
+from functools import lru_cache
 
 
 # MongoDB connection - MUST come from Streamlit secrets for security
@@ -99,6 +99,9 @@ LOGIN_TRANSLATIONS = {
 def get_mongo_client():
     """Get MongoDB client"""
     try:
+        # Imported on first use, not while the login page loads
+        from pymongo import MongoClient
+        
         if not MONGODB_URI:
             print("ERROR: MONGODB_URI is not set in secrets.toml")
             return None
@@ -195,7 +198,9 @@ class LocalDevCollection:
         return type('obj', (object,), {'modified_count': 0})
 
 
+@lru_cache(maxsize=1)
 def get_logo_base64():
+    """Logo for the login page, encoded once when the page is first shown."""
     try:
         with open("logo.png", "rb") as f:
             return base64.b64encode(f.read()).decode()
@@ -203,9 +208,6 @@ def get_logo_base64():
         return None
 
 
-LOGO_BASE64 = get_logo_base64()
-
-
 def hash_password(password):
     """Hash password using SHA-256"""
     return hashlib.sha256(password.encode()).hexdigest()
@@ -447,10 +449,11 @@ def show_login():
     col1, col2, col3 = st.columns([1, 3, 1])
     with col2:
         # Logo - centered
-        if LOGO_BASE64:
+        logo_base64 = get_logo_base64()
+        if logo_base64:
             st.markdown(f'''
             <div style="text-align: center; margin-bottom: 20px;">
-                <img src="data:image/png;base64,{LOGO_BASE64}" width="150" style="border-radius: 20px; box-shadow: 0 4px 20px rgba(0,0,0,0.1);">
+                <img src="data:image/png;base64,{logo_base64}" width="150" style="border-radius: 20px; box-shadow: 0 4px 20px rgba(0,0,0,0.1);">
             </div>
             ''', unsafe_allow_html=True)
         
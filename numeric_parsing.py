@@ -0,0 +1,128 @@
+"""
+Numeric text detection for GridToDash
+Finds text columns that actually hold numbers written with local
+conventions ("1.234,56", "€ 12,50", "(300)") and converts them with
+vectorized string operations.
+"""
+
+import re
+
+import pandas as pd
+
+
+# Rows sampled per text column to decide whether it is numeric
+SAMPLE_ROWS = 200
+
+# Share of non-empty values that must parse for a column to count as numeric
+MIN_NUMERIC_RATIO = 0.9
+
+_SYMBOLS = r'(?:R\$|€|\$|£|EUR|USD|%)'
+# Matched after whitespace is removed, so "1 234,50" is tested as "1234,50"
+_NUMBER = (
+    r'[-+]?\(?[-+]?' + _SYMBOLS + r'?[-+]?'
+    r'(?:\d{1,3}(?:[.,]\d{3})+|\d+)(?:[.,]\d+)?'
+    + _SYMBOLS + r'?\)?'
+)
+# Non-raw string: the regex engine behind pandas' Arrow strings has no \u escapes
+_WHITESPACE = '[\\s\u00a0]'
+_STRIP = r'R\$|€|\$|£|EUR|USD|%|' + _WHITESPACE
+_THOUSANDS_GROUP = re.compile(r'^\d{1,3}(?:[.,]\d{3})+$')
+
+
+def _decimal_votes(values):
+    """
+    Count how many sampled values can only be read with ',' or with '.'
+    as decimal separator. Values like "1.234" fit both and do not vote.
+    """
+    comma = dot = 0
+    for value in values:
+        digits = re.sub(_STRIP + r'|[()+-]', '', value)
+        has_comma, has_dot = ',' in digits, '.' in digits
+        if has_comma and has_dot:
+            if digits.rfind(',') > digits.rfind('.'):
+                comma += 1
+            else:
+                dot += 1
+        elif has_comma or has_dot:
+            sep = ',' if has_comma else '.'
+            if digits.count(sep) > 1 or _THOUSANDS_GROUP.match(digits):
+                # "1.234.567" or "1,234": the separator groups thousands
+                continue
+            if sep == ',':
+                comma += 1
+            else:
+                dot += 1
+    return comma, dot
+
+
+def detect_numeric_text(df, sample_rows=SAMPLE_ROWS, min_ratio=MIN_NUMERIC_RATIO):
+    """
+    Look at a sample of every text column and return {column: decimal}
+    for the columns that look numeric, where decimal is ',' or '.'.
+    """
+    formats = {}
+    for col in df.columns:
+        series = df[col]
+        if not (pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)):
+            continue
+        sample = series.dropna().head(sample_rows).astype(str).str.strip()
+        sample = sample[sample != '']
+        if sample.empty:
+            continue
+        # Codes with leading zeros ("00123") are identifiers, not amounts
+        if sample.str.match(r'^0\d').any():
+            continue
+        matches = sample.str.replace(_WHITESPACE, '', regex=True).str.fullmatch(_NUMBER)
+        if matches.mean() < min_ratio:
+            continue
+        comma, dot = _decimal_votes(sample[matches].tolist())
+        # Ambiguous columns follow the Portuguese convention of the app
+        formats[col] = '.' if dot > comma else ','
+    return formats
+
+
+def convert_numeric_text(series, decimal):
+    """Convert a text column to numbers using the given decimal separator."""
+    text = series.astype(str).str.strip()
+    # Accounting negatives: "(300)" means -300
+    text = text.str.replace(r'^\((.*)\)$', r'-\1', regex=True)
+    text = text.str.replace(_STRIP, '', regex=True)
+    if decimal == ',':
+        text = text.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+    else:
+        text = text.str.replace(',', '', regex=False)
+    numbers = pd.to_numeric(text, errors='coerce')
+    return numbers.where(series.notna())
+
+
+def convert_if_numeric(series, decimal, min_ratio=MIN_NUMERIC_RATIO):
+    """
+    Numbers of a text column (see convert_numeric_text), or None when fewer
+    than min_ratio of its non-empty values parse: then it is text after all.
+    """
+    numbers = convert_numeric_text(series, decimal)
+    present = series.notna() & (series.astype(str).str.strip() != '')
+    if present.any() and numbers[present].notna().mean() < min_ratio:
+        return None
+    return numbers
+
+
+def coerce_numeric_text(df, sample_rows=SAMPLE_ROWS, min_ratio=MIN_NUMERIC_RATIO):
+    """
+    Convert numeric-looking text columns of a DataFrame.
+    The sample decides which columns to try; a column is only replaced when
+    the full conversion keeps at least min_ratio of its values.
+    Returns the DataFrame and {column: decimal} of the converted columns.
+    """
+    formats = detect_numeric_text(df, sample_rows, min_ratio)
+    if not formats:
+        return df, {}
+
+    df = df.copy()
+    converted = {}
+    for col, decimal in formats.items():
+        numbers = convert_if_numeric(df[col], decimal, min_ratio)
+        if numbers is not None:
+            df[col] = numbers
+            converted[col] = decimal
+    return df, converted
@@ -0,0 +1,97 @@
+"""
+On-disk PDF cache for GridToDash
+Finished reports are stored by report key: a hash of the dataset content
+and every setting that changes the document (see pipeline.report_key).
+Cached reports are rendered deterministically, so a key always stands for
+the same bytes and works like an ETag: sessions, processes and replicas
+that share the folder serve each other's reports.
+"""
+
+import os
+import time
+import uuid
+
+
+# Where reports are stored; set to an empty string to disable the cache
+PDF_CACHE_DIR = os.getenv("GRIDTODASH_PDF_CACHE_DIR", ".gridtodash_pdf_cache")
+
+# Disk budget for the cache, in megabytes; least recently served reports go first
+PDF_CACHE_MAX_MB = float(os.getenv("GRIDTODASH_PDF_CACHE_MAX_MB", "512"))
+
+
+def _report_path(key):
+    return os.path.join(PDF_CACHE_DIR, f"{key}.pdf")
+
+
+def _remove(path):
+    # Another process may have removed it already
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def open_report(key):
+    """Path of the cached report, or None when it is not cached."""
+    if not PDF_CACHE_DIR:
+        return None
+    path = _report_path(key)
+    try:
+        # Mark as recently used for pruning
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+
+def save_report(key, write):
+    """
+    Render a report into the cache: write(f) writes the PDF to the binary
+    file f. The file only appears under its key once it is complete.
+    Returns the path, or None when the cache is disabled (write is not called).
+    """
+    if not PDF_CACHE_DIR:
+        return None
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    tmp = os.path.join(PDF_CACHE_DIR, f".tmp-{uuid.uuid4().hex}.pdf")
+    try:
+        with open(tmp, 'wb') as f:
+            write(f)
+        os.replace(tmp, _report_path(key))
+    finally:
+        _remove(tmp)
+    prune_reports(keep=key)
+    return _report_path(key)
+
+
+def prune_reports(max_bytes=None, keep=None):
+    """
+    Delete the least recently served reports until the cache fits its
+    budget. The report of key keep (just written) is never deleted.
+    """
+    if not PDF_CACHE_DIR or not os.path.isdir(PDF_CACHE_DIR):
+        return
+    if max_bytes is None:
+        max_bytes = PDF_CACHE_MAX_MB * 1024 * 1024
+
+    reports = []
+    cutoff = time.time() - 3600
+    for entry in os.scandir(PDF_CACHE_DIR):
+        if not entry.is_file():
+            continue
+        stat = entry.stat()
+        if entry.name.startswith('.tmp-'):
+            # Leftovers from interrupted writes
+            if stat.st_mtime < cutoff:
+                _remove(entry.path)
+            continue
+        reports.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in reports)
+    kept = _report_path(keep) if keep is not None else None
+    for _, size, path in sorted(reports):
+        if total <= max_bytes:
+            break
+        if path == kept:
+            continue
+        _remove(path)
+        total -= size
@@ -0,0 +1,252 @@
+"""
+Streaming PDF output for GridToDash
+FPDF keeps every finished page in memory and builds the whole document as
+one string when it is closed. StreamingPDF writes each page to a binary
+file object as soon as the page is finished, so a report with thousands of
+table pages is written with the memory of about one page. Fonts, images
+and the page tree follow at the end, as in FPDF, and the output is the
+same document FPDF would produce, except that it is always PDF 1.4: FPDF
+raises the version when a PNG with transparency is added, which may come
+after the first pages were written.
+Pages can also be rendered elsewhere, e.g. in worker processes: a
+page_renderer() built from the document's page_state() collects finished
+page contents, and put_page() adds them to the document in order.
+Binary data is not copied through FPDF's text buffer: content streams and
+images are written to the file as bytes.
+"""
+
+import zlib
+
+from fpdf import FPDF
+
+
+# What a page renderer takes over from its document: page geometry, fonts
+# and the graphics state that carries over to the next page
+_PAGE_STATE = (
+    'k', 'def_orientation', 'cur_orientation', 'fw_pt', 'fh_pt', 'fw', 'fh', 'w_pt', 'h_pt', 'w', 'h',
+    'l_margin', 't_margin', 'r_margin', 'b_margin', 'c_margin', 'auto_page_break', 'page_break_trigger',
+    'compress', 'pdf_version', 'fonts', 'core_fonts', 'font_family', 'font_style', 'underline',
+    'font_size_pt', 'font_size', 'current_font', 'line_width', 'draw_color', 'fill_color', 'text_color',
+    'color_flag', 'ws', 'str_alias_nb_pages', 'total_pages',
+)
+
+
+class StreamingPDF(FPDF):
+    """
+    FPDF that writes finished pages straight to stream, a writable binary
+    file object. Call close() to finish the document. Internal links are
+    not supported. With the total page alias (alias_nb_pages()), pages wait
+    in memory until set_total_pages() is called, or until close(). Set
+    creation_date to False to leave the creation time out, so the same
+    content gives the same bytes.
+    Without a stream, finished pages are kept in rendered as content
+    streams, for put_page() of another document.
+    """
+
+    def __init__(self, stream, orientation='P', unit='mm', format='A4'):
+        FPDF.__init__(self, orientation, unit, format)
+        self.pdf_version = '1.4'
+        self.stream = stream
+        self.bytes_written = 0
+        self.page_objects = []
+        self.held_pages = []
+        self.rendered = []
+        self.page_offset = 0
+        self.total_pages = None
+        self.creation_date = True
+
+    def _offset(self):
+        """Position of the next output byte in the whole document."""
+        return self.bytes_written + len(self.buffer)
+
+    def _write(self, data):
+        self.stream.write(data)
+        self.bytes_written += len(data)
+
+    def _flush(self):
+        if self.buffer:
+            self._write(self.buffer.encode('latin-1'))
+            self.buffer = ''
+
+    def _putstream(self, s):
+        # Straight to the file, not decoded into the text buffer and encoded back
+        self._out('stream')
+        self._flush()
+        self._write(s.encode('latin-1') if isinstance(s, str) else s)
+        self._out('\nendstream')
+
+    def _page_size(self):
+        if self.def_orientation == 'P':
+            return self.fw_pt, self.fh_pt
+        return self.fh_pt, self.fw_pt
+
+    def open(self):
+        FPDF.open(self)
+        self._putheader()
+
+    def _newobj(self):
+        self.n += 1
+        self.offsets[self.n] = self._offset()
+        self._out(str(self.n) + ' 0 obj')
+
+    def page_no(self):
+        return self.page_offset + self.page
+
+    def set_total_pages(self, total):
+        """Number of pages the document will have, for the total page alias."""
+        self.total_pages = total
+
+    def page_state(self):
+        """What a page_renderer() needs to render further pages of this document."""
+        return {name: getattr(self, name) for name in _PAGE_STATE if hasattr(self, name)}
+
+    def end_page(self):
+        """Finish the current page (footer included), as add_page() does before a new one."""
+        self.in_footer = 1
+        self.footer()
+        self.in_footer = 0
+        self._endpage()
+
+    def put_page(self, content):
+        """
+        Add a page rendered by a page_renderer() after the last finished
+        page. There is no current page afterwards: call end_page() first
+        and only close() after the last put_page().
+        """
+        self.page += 1
+        self._putpage_content(content, False)
+        self._flush()
+
+    def close(self):
+        if self.state == 3:
+            return
+        if self.page == 0:
+            self.add_page()
+        # After put_page() no page is open
+        if self.state == 2:
+            self.end_page()
+        if self.total_pages is None:
+            self.total_pages = self.page
+            self._putheld()
+        self._enddoc()
+
+    def _endpage(self):
+        FPDF._endpage(self)
+        if self.stream is None:
+            self.rendered.append(self._page_content(self.page))
+            return
+        self.held_pages.append(self.page)
+        if self.total_pages is not None or not hasattr(self, 'str_alias_nb_pages'):
+            self._putheld()
+
+    def _putheld(self):
+        for n in self.held_pages:
+            self._putpage(n)
+        self.held_pages = []
+        self._flush()
+
+    def _page_content(self, n):
+        """Content stream of page n, ready to write; the page text is dropped."""
+        content = self.pages[n]
+        self.pages[n] = ''
+        if hasattr(self, 'str_alias_nb_pages'):
+            content = content.replace(self.str_alias_nb_pages, str(self.total_pages))
+        content = content.encode('latin-1')
+        if self.compress:
+            content = zlib.compress(content)
+        return content
+
+    def _putpage(self, n):
+        """Write page n and its content stream, then drop the content."""
+        self._putpage_content(self._page_content(n), n in self.orientation_changes)
+
+    def _putpage_content(self, content, rotated):
+        w_pt, h_pt = self._page_size()
+        self._newobj()
+        self.page_objects.append(self.n)
+        self._out('<</Type /Page')
+        self._out('/Parent 1 0 R')
+        if rotated:
+            self._out('/MediaBox [0 0 %.2f %.2f]' % (h_pt, w_pt))
+        self._out('/Resources 2 0 R')
+        if self.pdf_version > '1.3':
+            self._out('/Group <</Type /Group /S /Transparency /CS /DeviceRGB>>')
+        self._out('/Contents ' + str(self.n + 1) + ' 0 R>>')
+        self._out('endobj')
+
+        self._newobj()
+        self._out('<<' + ('/Filter /FlateDecode ' if self.compress else '') + '/Length ' + str(len(content)) + '>>')
+        self._putstream(content)
+        self._out('endobj')
+
+    def _putpages(self):
+        # Pages were written as they were finished: only the page tree is left
+        w_pt, h_pt = self._page_size()
+        self.offsets[1] = self._offset()
+        self._out('1 0 obj')
+        self._out('<</Type /Pages')
+        self._out('/Kids [' + ''.join(f'{obj} 0 R ' for obj in self.page_objects) + ']')
+        self._out('/Count ' + str(len(self.page_objects)))
+        self._out('/MediaBox [0 0 %.2f %.2f]' % (w_pt, h_pt))
+        self._out('>>')
+        self._out('endobj')
+
+    def _putresources(self):
+        self._putfonts()
+        self._putimages()
+        self.offsets[2] = self._offset()
+        self._out('2 0 obj')
+        self._out('<<')
+        self._putresourcedict()
+        self._out('>>')
+        self._out('endobj')
+
+    def _putinfo(self):
+        FPDF._putinfo(self)
+        if not self.creation_date:
+            # FPDF always stamps the current time last
+            self.buffer = self.buffer[:self.buffer.rindex('/CreationDate')]
+
+    def _enddoc(self):
+        self._putpages()
+        self._putresources()
+        # Info
+        self._newobj()
+        self._out('<<')
+        self._putinfo()
+        self._out('>>')
+        self._out('endobj')
+        # Catalog
+        self._newobj()
+        self._out('<<')
+        self._putcatalog()
+        self._out('>>')
+        self._out('endobj')
+        # Cross-reference table and trailer
+        xref = self._offset()
+        self._out('xref')
+        self._out('0 ' + str(self.n + 1))
+        self._out('0000000000 65535 f ')
+        for i in range(1, self.n + 1):
+            self._out('%010d 00000 n ' % self.offsets[i])
+        self._out('trailer')
+        self._out('<<')
+        self._puttrailer()
+        self._out('>>')
+        self._out('startxref')
+        self._out(str(xref))
+        self._out('%%EOF')
+        self.state = 3
+        self._flush()
+
+
+def page_renderer(cls, state, first_page):
+    """
+    A cls (a StreamingPDF class) without a stream, set up from state (see
+    StreamingPDF.page_state) to render pages first_page, first_page + 1, ...
+    of that document. Finished pages are collected in its rendered list.
+    """
+    pdf = cls(None)
+    pdf.__dict__.update(state)
+    pdf.page_offset = first_page - 1
+    return pdf
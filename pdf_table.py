@@ -0,0 +1,262 @@
+"""
+PDF data table for GridToDash
+Cells are built in two stages instead of one Python call per cell:
+format_table turns a block of rows into a matrix of cell texts with
+vectorized formatting per dtype, and draw_table emits whole pages of those
+cells as the same PDF operators FPDF's cell() writes, with text widths
+taken from a lookup table.
+Long tables are split into runs of whole pages that worker processes draw
+in parallel; the main process writes the finished pages in order.
+"""
+
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from pdf_stream import page_renderer
+
+
+# Characters kept per cell and per header
+CELL_CHARS = 12
+HEADER_CHARS = 10
+
+# Rows formatted at a time: bounds the memory of the cell matrices
+FORMAT_ROWS = 10000
+
+ROW_HEIGHT = 6
+HEADER_HEIGHT = 7
+MAX_TABLE_WIDTH = 195
+MAX_COLUMN_WIDTH = 22
+
+# Tables with more pages than this are drawn in worker processes
+PARALLEL_PAGES = int(os.getenv("GRIDTODASH_PDF_PARALLEL_PAGES", "200"))
+
+# Worker processes for long tables (0: one per available core)
+PDF_WORKERS = int(os.getenv("GRIDTODASH_PDF_WORKERS", "0"))
+
+# Pages drawn per worker job
+JOB_PAGES = 50
+
+
+def _text_column(series, width):
+    """Text of any column as a string array; characters outside Latin-1 (which the PDF fonts lack) become '?'."""
+    text = series.astype(str).str.slice(0, width)
+    text = text.str.encode('latin-1', errors='replace').str.decode('latin-1')
+    return text.to_numpy(dtype=object).astype(f'<U{width}')
+
+
+def format_column(series, width=CELL_CHARS):
+    """Cell texts of one column, cut to width characters. Missing values are blank."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Each category is formatted once, then picked by code
+        categories = format_column(pd.Series(series.cat.categories), width)
+        codes = series.cat.codes.to_numpy()
+        return np.where(codes >= 0, categories[codes], '').astype(f'<U{width}')
+
+    missing = series.isna().to_numpy()
+    numpy_dtype = getattr(dtype, 'numpy_dtype', dtype)
+    if pd.api.types.is_bool_dtype(dtype):
+        text = series.to_numpy(dtype=bool, na_value=False).astype(str)
+    elif pd.api.types.is_integer_dtype(dtype):
+        text = series.to_numpy(dtype=numpy_dtype, na_value=0).astype(str)
+    elif pd.api.types.is_float_dtype(dtype):
+        # Shortest repr, as str() gives it
+        text = series.to_numpy(dtype=numpy_dtype, na_value=np.nan).astype(str)
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        dates_only = bool((series.dt.normalize() == series)[~missing].all())
+        text = _text_column(series.dt.strftime('%Y-%m-%d' if dates_only else '%Y-%m-%d %H:%M:%S'), width)
+    else:
+        text = _text_column(series, width)
+    text = text.astype(f'<U{width}')
+    text[missing] = ''
+    return text
+
+
+def format_table(frame, width=CELL_CHARS):
+    """Cell texts of every row and column of frame, as a (rows, columns) string array."""
+    if not len(frame.columns):
+        return np.empty((len(frame), 0), dtype=f'<U{width}')
+    return np.stack([format_column(frame.iloc[:, i], width) for i in range(len(frame.columns))], axis=1)
+
+
+def _string_widths(pdf, cells):
+    """Width of every cell text in the current core font, like pdf.get_string_width()."""
+    cw = pdf.current_font['cw']
+    widths = np.array([cw.get(chr(code), 0) for code in range(256)], dtype=np.int64)
+    # Shorter texts are padded with code 0
+    widths[0] = 0
+    codes = np.ascontiguousarray(cells).view(np.uint32).reshape(cells.shape + (-1,))
+    return widths[codes].sum(axis=-1) * pdf.font_size / 1000.0
+
+
+def _escape(cells):
+    for char, escaped in (('\\', '\\\\'), (')', '\\)'), ('(', '\\('), ('\r', '\\r')):
+        cells = np.char.replace(cells, char, escaped)
+    return cells
+
+
+def _draw_header(pdf, columns, col_width):
+    pdf.set_font('Arial', 'B', 7)
+    pdf.set_fill_color(30, 58, 95)
+    pdf.set_text_color(255, 255, 255)
+    for col in columns:
+        pdf.cell(col_width, HEADER_HEIGHT, str(col)[:HEADER_CHARS], 1, 0, 'C', True)
+    pdf.ln()
+    pdf.set_font('Arial', '', 7)
+    pdf.set_text_color(0, 0, 0)
+
+
+def _page_rows(pdf, y, rows):
+    """Positions of the next rows (at most rows) that fit on the page from y."""
+    ys = []
+    while len(ys) < rows and y + ROW_HEIGHT <= pdf.page_break_trigger:
+        ys.append(y)
+        y += ROW_HEIGHT
+    return ys
+
+
+def _draw_rows(pdf, columns, col_width, cells):
+    """
+    Write bordered, centered cells row after row, starting a new page (with
+    the header) whenever the next row does not fit.
+    """
+    k = pdf.k
+    h = ROW_HEIGHT
+    # Column positions, added up the way consecutive cell() calls move x
+    xs = []
+    x = pdf.l_margin
+    for _ in columns:
+        xs.append(x)
+        x += col_width
+    xs = np.array(xs)
+
+    text_x = np.char.mod('%.2f', (xs + (col_width - _string_widths(pdf, cells)) / 2.0) * k)
+    texts = _escape(cells)
+    rect_x = np.array(['%.2f ' % (x * k) for x in xs])
+    rect_size = ' %.2f %.2f re S ' % (col_width * k, -h * k)
+    color_on, color_off = ('q ' + pdf.text_color + ' ', ' Q') if pdf.color_flag else ('', '')
+
+    row = 0
+    while row < len(cells):
+        if pdf.y + h > pdf.page_break_trigger:
+            pdf.add_page()
+            _draw_header(pdf, columns, col_width)
+        # Rows that fit on this page
+        ys = _page_rows(pdf, pdf.y, len(cells) - row)
+        y = ys[-1] + h
+        ys = np.array(ys)
+        page = slice(row, row + len(ys))
+
+        rect_y = np.char.mod('%.2f', (pdf.h - ys) * k)[:, None]
+        text_y = np.char.mod('%.2f', (pdf.h - (ys + .5 * h + .3 * pdf.font_size)) * k)[:, None]
+        rects = np.char.add(np.char.add(rect_x, rect_y), rect_size)
+        text = np.char.add(np.char.add(np.char.add(np.char.add(color_on + 'BT ', text_x[page]), ' '), text_y), ' Td (')
+        text = np.char.add(np.char.add(text, texts[page]), ') Tj ET' + color_off)
+        out = np.where(cells[page] == '', rects, np.char.add(rects, text))
+        pdf._out('\n'.join(out.ravel().tolist()))
+
+        pdf.x = pdf.l_margin
+        pdf.y = y
+        pdf.lasth = h
+        row += len(ys)
+
+
+def _draw_blocks(pdf, columns, col_width, blocks):
+    for block in blocks:
+        for start in range(0, len(block), FORMAT_ROWS):
+            _draw_rows(pdf, columns, col_width, format_table(block.iloc[start:start + FORMAT_ROWS]))
+
+
+def _worker_count():
+    if PDF_WORKERS:
+        return PDF_WORKERS
+    # Batch jobs already run one per core
+    if multiprocessing.parent_process() is not None:
+        return 1
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def _split_rows(blocks, first, size):
+    """The rows of blocks as lists of frames: first rows, then size rows per list."""
+    parts, count, want = [], 0, first
+    for block in blocks:
+        while True:
+            part = block.iloc[:want - count]
+            if len(part):
+                parts.append(part)
+                count += len(part)
+                block = block.iloc[len(part):]
+            if count < want:
+                break
+            yield parts
+            parts, count, want = [], 0, size
+    if parts:
+        yield parts
+
+
+def _render_pages(cls, state, columns, col_width, blocks, first_page):
+    """Worker job: table pages from first_page on, as content streams."""
+    pdf = page_renderer(cls, state, first_page)
+    pdf.add_page()
+    _draw_header(pdf, columns, col_width)
+    _draw_blocks(pdf, columns, col_width, blocks)
+    pdf.end_page()
+    return pdf.rendered
+
+
+def _draw_parallel(pdf, columns, col_width, blocks, first_rows, job_rows, workers):
+    jobs = _split_rows(blocks, first_rows, job_rows)
+    # The rows that fit on the current page are drawn here
+    _draw_blocks(pdf, columns, col_width, next(jobs, []))
+    state = pdf.page_state()
+    page = pdf.page_no() + 1
+    pdf.end_page()
+
+    # spawn: forking a process that runs Streamlit's threads is not safe
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(_render_pages, type(pdf), state, columns, col_width, job, page))
+            page += JOB_PAGES
+            # Finished pages are written in order; a few jobs ahead keep the workers busy
+            while len(pending) > 2 * workers or (pending and pending[0].done()):
+                for content in pending.popleft().result():
+                    pdf.put_page(content)
+        while pending:
+            for content in pending.popleft().result():
+                pdf.put_page(content)
+
+
+def draw_table(pdf, columns, blocks, rows):
+    """
+    Data table of the rows in blocks (DataFrames with these columns, rows
+    in all), repeating the header on each new page. pdf is a StreamingPDF;
+    its total page count is known once the table starts, so the table has
+    to come last. Long tables are drawn by worker processes.
+    """
+    # Calculate column width - dynamic based on number of columns
+    col_width = min(MAX_COLUMN_WIDTH, MAX_TABLE_WIDTH / len(columns))
+    _draw_header(pdf, columns, col_width)
+
+    # Page layout: the rest of this page, then full pages of page_rows
+    first_rows = len(_page_rows(pdf, pdf.y, rows))
+    blank = page_renderer(type(pdf), pdf.page_state(), 1)
+    blank.add_page()
+    _draw_header(blank, columns, col_width)
+    page_rows = len(_page_rows(blank, blank.y, rows))
+    pages = -(-(rows - first_rows) // page_rows) if rows > first_rows else 0
+    pdf.set_total_pages(pdf.page_no() + pages)
+
+    workers = _worker_count()
+    if pages <= PARALLEL_PAGES or workers < 2:
+        _draw_blocks(pdf, columns, col_width, blocks)
+    else:
+        _draw_parallel(pdf, columns, col_width, blocks, first_rows, page_rows * JOB_PAGES, workers)
@@ -0,0 +1,681 @@
+"""
+Report pipeline for GridToDash
+The load -> metrics -> chart -> PDF chain without any Streamlit code, shared
+by the web app (app.py) and the command line (cli.py).
+"""
+
+import copy
+import os
+import shutil
+from datetime import datetime
+from io import BytesIO, FileIO
+
+import pandas as pd
+
+from dataset_cache import DATASET_CACHE, dataset_key
+from csv_stream import CHUNK_ROWS, read_fraction, should_stream, stream_csv
+from xlsx_reader import read_xlsx
+from column_store import open_dataset, save_dataset
+from compaction import compact_dtypes, compact_like
+from numeric_parsing import coerce_numeric_text, convert_numeric_text, detect_numeric_text
+from column_stats import ColumnStats, compute_summary
+from aggregation import AGGREGATE_CACHE, aggregate, aggregate_csv
+from profiling import is_identifier, profile_dataframe, suggest_columns
+from appends import APPEND_INDEX
+from pdf_stream import StreamingPDF
+from pdf_cache import open_report, save_report
+from pdf_table import draw_table
+from charts import (CHART_CACHE, CHART_STYLE, INTERACTIVE_POINTS, bar_chart_spec, draw_pdf_chart,
+                    generate_bar_chart, interactive_chart)
+
+
+# Bump when parsing changes, so datasets stored by an older loader are not reused
+LOADER_VERSION = 2
+
+# Bump when the PDF layout changes, so cached reports are not reused
+TEMPLATE_VERSION = 2
+
+# Uploads above this size (in megabytes) show a preview while the rest loads
+PREVIEW_FIRST_MB = float(os.getenv("GRIDTODASH_PREVIEW_MB", "5"))
+
+# Rows read for the preview: enough to infer column types
+PREVIEW_ROWS = 1000
+
+
+class LoadCancelled(Exception):
+    """Raised from a progress callback to stop a load that is no longer needed."""
+
+
+class LocalFile(FileIO):
+    """
+    A file on disk with the same interface as a Streamlit upload (name,
+    size, read, seek), without getvalue(): it is hashed in blocks and parsed
+    from disk, so it is never held in memory as a whole.
+    """
+    
+    def __init__(self, path):
+        super().__init__(path, 'rb')
+        self.name = os.path.basename(path)
+        self.size = os.fstat(self.fileno()).st_size
+
+
+class MemoryFile(BytesIO):
+    """Bytes with the same interface as a Streamlit upload (name, size, getvalue)."""
+    
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+def _contents(uploaded_file):
+    """What to hash an upload by: its bytes when in memory, otherwise the file itself."""
+    return uploaded_file.getvalue() if hasattr(uploaded_file, 'getvalue') else uploaded_file
+
+
+def load_data(uploaded_file, sheet_name=None, max_rows=None, progress=None):
+    """
+    Load Excel or CSV file into a Pandas DataFrame.
+    Handles both .xlsx and .csv formats.
+    Excel sheets are streamed in read-only mode; max_rows stops reading early.
+    Text columns holding numbers like "1.234,56" or "€ 12,50" are converted.
+    progress(rows, fraction) is called while reading; it may raise
+    LoadCancelled to stop.
+    """
+    try:
+        uploaded_file.seek(0)
+        if uploaded_file.name.endswith('.csv') and progress is not None:
+            # Read in chunks so there is something to report
+            chunks = []
+            rows = 0
+            for chunk in pd.read_csv(uploaded_file, nrows=max_rows, chunksize=CHUNK_ROWS):
+                chunks.append(chunk)
+                rows += len(chunk)
+                progress(rows, read_fraction(uploaded_file))
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+        elif uploaded_file.name.endswith('.csv'):
+            df = pd.read_csv(uploaded_file, nrows=max_rows)
+        else:
+            df = read_xlsx(uploaded_file, sheet_name=sheet_name, max_rows=max_rows, progress=progress)
+        
+        if df.empty:
+            raise ValueError("The uploaded file is empty.")
+        
+        df, text_formats = coerce_numeric_text(df)
+        # Appended rows are parsed with the same decimal separators (see _append_rows)
+        df.attrs['text_formats'] = text_formats
+        return df
+    except LoadCancelled:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error loading file: {str(e)}")
+
+
+def dataset_cache_key(uploaded_file, sheet_name=None):
+    """Cache key of an upload: its content hash plus the options used to parse it."""
+    file_type = 'csv' if uploaded_file.name.endswith('.csv') else 'xlsx'
+    streamed = file_type == 'csv' and should_stream(uploaded_file.size)
+    return dataset_key(_contents(uploaded_file), file_type=file_type, streamed=streamed,
+                       sheet_name=sheet_name, loader=LOADER_VERSION)
+
+
+def preview_first(size_bytes):
+    """Return True when an upload is big enough to show a preview before the full load."""
+    return size_bytes > PREVIEW_FIRST_MB * 1024 * 1024
+
+
+def load_preview(uploaded_file, sheet_name=None, key=None, rows=PREVIEW_ROWS):
+    """
+    Read only the first rows of an upload.
+    Returns a dataset dict like load_dataset(), flagged with 'preview': True,
+    which is enough for the column selectors and the data preview.
+    """
+    key = f"{key or dataset_cache_key(uploaded_file, sheet_name)}:preview"
+    dataset = DATASET_CACHE.get(key)
+    if dataset is None:
+        df = load_data(uploaded_file, sheet_name=sheet_name, max_rows=rows)
+        dataset = {
+            'key': key,
+            'df': df,
+            'numeric_cols': identify_numeric_columns(df),
+            'preview': True
+        }
+        DATASET_CACHE.put(key, dataset)
+    return dataset
+
+
+def _streamed_dataset(key, summary):
+    """Dataset dict of a stream_csv() result."""
+    if not summary['numeric_cols']:
+        raise ValueError("No numeric columns found in the uploaded file.")
+    profiler = summary.pop('profiler')
+    return {
+        'key': key,
+        'df': summary.pop('head'),
+        'top_rows': summary.pop('top_rows'),
+        'profiler': profiler,
+        'profile': profiler.result(),
+        'numeric_cols': summary['numeric_cols'],
+        'summary': summary
+    }
+
+
+def _store(key, df):
+    try:
+        save_dataset(key, df)
+    except OSError as e:
+        print(f"Could not save dataset to the column store: {e}")
+
+
+def _append_rows(key, base, tail):
+    """
+    Dataset dict of an in-memory dataset plus the rows in tail (CSV without
+    header). Statistics and profile that were already computed are updated
+    with the new rows only.
+    """
+    old = base['df']
+    numeric_cols = list(base['numeric_cols'])
+    # Text columns are read as written, so '00123' and '1.50' stay as they are
+    text_cols = {col: str for col in old.columns
+                 if col not in numeric_cols and not pd.api.types.is_bool_dtype(old[col])}
+    new = pd.read_csv(tail, header=None, names=old.columns.tolist(), dtype=text_cols)
+    
+    # Parse the new rows the way the whole file was parsed: with the decimal
+    # separator chosen for each column then, not one guessed from the tail
+    text_formats = dict(old.attrs.get('text_formats', {}))
+    text = [col for col in numeric_cols if not pd.api.types.is_numeric_dtype(new[col])]
+    unknown = [col for col in text if col not in text_formats]
+    if unknown:
+        text_formats.update(detect_numeric_text(new[unknown]))
+    for col in text:
+        if col in text_formats:
+            new[col] = convert_numeric_text(new[col], text_formats[col])
+    for col in numeric_cols:
+        if not pd.api.types.is_numeric_dtype(new[col]):
+            raise ValueError(f"Column '{col}' is no longer numeric")
+    
+    # Only the new rows are compacted, to the dtypes of the earlier ones
+    new, old = compact_like(new, old)
+    df = pd.concat([old, new], ignore_index=True)
+    df.attrs = {'text_formats': text_formats}
+    dataset = {
+        'key': key,
+        'df': df,
+        'numeric_cols': numeric_cols,
+        'bytes_saved': base.get('bytes_saved', 0)
+    }
+    if 'summary' in base:
+        stats = ColumnStats.from_result(base['summary']['column_stats'], len(old))
+        stats.update(new)
+        dataset['summary'] = {'total_records': len(df), 'column_stats': stats.result()}
+    if 'profiler' in base:
+        profiler = profile_dataframe(new, profiler=copy.deepcopy(base['profiler']))
+        dataset['profiler'] = profiler
+        dataset['profile'] = profiler.result()
+    _store(key, df)
+    return dataset
+
+
+def _load_appended(uploaded_file, key, streamed, progress=None):
+    """
+    Load a CSV upload that is an earlier, still cached upload plus rows added
+    at the end, parsing only the new rows. Returns None when there is no
+    such upload or the new rows do not fit it.
+    """
+    data = _contents(uploaded_file)
+    match = APPEND_INDEX.find(data, streamed)
+    if match is None:
+        return None
+    base_key, length = match
+    base = DATASET_CACHE.get(base_key)
+    if base is None:
+        return None
+    
+    if isinstance(data, bytes):
+        tail = BytesIO(memoryview(data)[length:])
+    else:
+        # The file itself, from the first new row on
+        tail = data
+        tail.seek(length)
+    try:
+        if streamed:
+            resume = dict(base['summary'], head=base['df'], top_rows=base['top_rows'],
+                          profiler=base['profiler'])
+            return _streamed_dataset(key, stream_csv(tail, progress=progress, resume=resume))
+        return _append_rows(key, base, tail)
+    except (ValueError, pd.errors.ParserError) as e:
+        print(f"Could not add the appended rows to the earlier upload, loading it in full: {e}")
+        return None
+
+
+def load_dataset(uploaded_file, sheet_name=None, key=None, progress=None):
+    """
+    Load an uploaded file through the dataset cache.
+    Returns a dict with the cache key, the DataFrame and its numeric columns,
+    so reruns with the same file skip parsing and column detection.
+    Large CSV files are streamed in chunks: 'df' then only holds the first
+    rows, 'top_rows' the chart candidates, 'summary' the column statistics
+    and 'profile' the column profile.
+    Other files are compacted (see compaction.py) and kept in the on-disk
+    column store, so later sessions reopen them memory-mapped instead of
+    parsing them again. progress is passed on to the file reader.
+    A CSV that is an earlier upload plus appended rows (see appends.py)
+    only has its new rows parsed.
+    """
+    key = key or dataset_cache_key(uploaded_file, sheet_name)
+    
+    dataset = DATASET_CACHE.get(key)
+    if dataset is None:
+        is_csv = uploaded_file.name.endswith('.csv')
+        streamed = is_csv and should_stream(uploaded_file.size)
+        stored = None if streamed else open_dataset(key)
+        if stored is None and is_csv:
+            dataset = _load_appended(uploaded_file, key, streamed, progress)
+        
+        if dataset is None and streamed:
+            uploaded_file.seek(0)
+            dataset = _streamed_dataset(key, stream_csv(uploaded_file, progress=progress))
+        elif dataset is None:
+            bytes_saved = 0
+            df = stored
+            if df is None:
+                df, bytes_saved = compact_dtypes(load_data(uploaded_file, sheet_name=sheet_name,
+                                                           progress=progress))
+                _store(key, df)
+            dataset = {
+                'key': key,
+                'df': df,
+                'numeric_cols': identify_numeric_columns(df),
+                'bytes_saved': bytes_saved
+            }
+        if is_csv:
+            APPEND_INDEX.record(_contents(uploaded_file), key, streamed)
+        DATASET_CACHE.put(key, dataset)
+    return dataset
+
+
+def identify_numeric_columns(df):
+    """Identify and return list of numeric columns in the DataFrame."""
+    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    if not numeric_cols:
+        raise ValueError("No numeric columns found in the uploaded file.")
+    return numeric_cols
+
+
+def dataset_summary(dataset):
+    """
+    Statistics for every numeric column of a loaded dataset.
+    Computed on first use and kept in the dataset dict, which lives in the
+    dataset cache, so switching the metrics column never rescans the data.
+    Streamed datasets already carry the summary built while reading.
+    """
+    summary = dataset.get('summary')
+    if summary is None:
+        summary = compute_summary(dataset['df'], dataset['numeric_cols'])
+        dataset['summary'] = summary
+    return summary
+
+
+def dataset_profile(dataset):
+    """
+    Column profile of a loaded dataset (see profiling.py), computed once and
+    kept in the dataset dict. Streamed datasets are profiled while reading.
+    """
+    profile = dataset.get('profile')
+    if profile is None:
+        # The profiler keeps its sketches, so appended rows can be added later
+        dataset['profiler'] = profile_dataframe(dataset['df'])
+        profile = dataset['profile'] = dataset['profiler'].result()
+    return profile
+
+
+def default_columns(dataset):
+    """Default metrics and X-axis columns, chosen from the column profile."""
+    return suggest_columns(dataset_profile(dataset), dataset['df'].columns.tolist(),
+                           list(dataset['numeric_cols']))
+
+
+def calculate_key_metrics(df, selected_column, summary=None):
+    """
+    Calculate key metrics from the DataFrame.
+    Returns: Total Records, Total Sum, Average, Min, Max, Std Dev and missing
+    values for the selected column. With a summary (see dataset_summary)
+    this is a lookup and no column is scanned.
+    """
+    if summary is None:
+        summary = compute_summary(df, [selected_column])
+    stats = summary['column_stats'][selected_column]
+    
+    return {
+        'total_records': summary['total_records'],
+        'total_sum': stats['sum'],
+        'average_value': stats['mean'],
+        'min_value': stats['min'],
+        'max_value': stats['max'],
+        'std_dev': stats['std'],
+        'missing_values': stats['nulls'],
+        'primary_column': selected_column
+    }
+
+
+def chart_data(dataset, x_axis_col, y_axis_col, numeric_cols, aggregation=None, source=None):
+    """
+    Rows to plot for the bar chart.
+    Without aggregation these are the raw rows (the streamed top rows for
+    large CSV files). With 'sum', 'mean', 'count' or 'max' the rows are
+    grouped by the X-axis column, indexed by group label, and cached per
+    dataset and settings. Streamed datasets re-read their columns from
+    source, the uploaded file.
+    """
+    if not aggregation:
+        return dataset.get('top_rows', dataset['df'])
+    value_cols = list(dict.fromkeys([y_axis_col] + list(numeric_cols[:5])))
+    cache_key = (dataset['key'], x_axis_col, tuple(value_cols), aggregation)
+    data = AGGREGATE_CACHE.get(cache_key)
+    if data is None:
+        if 'top_rows' in dataset:
+            data = aggregate_csv(source, x_axis_col, value_cols, aggregation,
+                                 dataset['summary'].get('text_formats'), CHUNK_ROWS)
+        else:
+            data = aggregate(dataset['df'], x_axis_col, value_cols, aggregation)
+        AGGREGATE_CACHE.put(cache_key, data)
+    return data
+
+
+def bar_chart(dataset, x_axis_col, y_axis_col, numeric_cols, aggregation=None, source=None):
+    """
+    Bar chart PNG of a dataset in a BytesIO, rendered once per dataset and
+    chart settings: reruns, the on-screen chart and the PDF reuse it.
+    """
+    cache_key = (dataset['key'], x_axis_col, y_axis_col, tuple(numeric_cols), aggregation, CHART_STYLE)
+    png = CHART_CACHE.get(cache_key)
+    if png is None:
+        rows = chart_data(dataset, x_axis_col, y_axis_col, numeric_cols, aggregation, source)
+        png = generate_bar_chart(rows, x_axis_col, y_axis_col, numeric_cols, aggregation).getvalue()
+        CHART_CACHE.put(cache_key, png)
+    return BytesIO(png)
+
+
+def interactive_bar_chart(dataset, x_axis_col, y_axis_col, numeric_cols, aggregation=None, source=None):
+    """
+    Downsampled data and Vega-Lite spec for the in-browser chart (see
+    charts.interactive_chart), built once per dataset and chart settings.
+    Zooming and hovering happen in the browser without a rerun.
+    """
+    cache_key = ('interactive', dataset['key'], x_axis_col, y_axis_col, tuple(numeric_cols), aggregation,
+                 INTERACTIVE_POINTS)
+    chart = CHART_CACHE.get(cache_key)
+    if chart is None:
+        rows = chart_data(dataset, x_axis_col, y_axis_col, numeric_cols, aggregation, source)
+        chart = interactive_chart(rows, x_axis_col, y_axis_col, numeric_cols, aggregation)
+        CHART_CACHE.put(cache_key, chart)
+    return chart
+
+
+def table_blocks(dataset, columns, source=None, block_rows=CHUNK_ROWS):
+    """
+    Every row of the given columns in blocks of block_rows, for the full
+    data table of the PDF. Streamed datasets re-read their rows in chunks
+    from source, the uploaded file.
+    """
+    if 'top_rows' not in dataset:
+        df = dataset['df']
+        for start in range(0, len(df), block_rows):
+            yield df.iloc[start:start + block_rows][columns]
+        return
+    text_formats = dataset['summary'].get('text_formats') or {}
+    source.seek(0)
+    for chunk in pd.read_csv(source, usecols=columns, chunksize=block_rows):
+        for col, decimal in text_formats.items():
+            if col in chunk:
+                chunk[col] = convert_numeric_text(chunk[col], decimal)
+        yield chunk[columns]
+
+
+def chart_spec(dataset, x_axis_col, y_axis_col, numeric_cols, aggregation=None, source=None):
+    """Bar chart of a dataset as data (see charts.bar_chart_spec), for drawing into the PDF."""
+    rows = chart_data(dataset, x_axis_col, y_axis_col, numeric_cols, aggregation, source)
+    return bar_chart_spec(rows, x_axis_col, y_axis_col, numeric_cols, aggregation)
+
+
+class PDFReport(StreamingPDF):
+    """Custom PDF Report Generator using FPDF, written out page by page (see pdf_stream.py)."""
+    
+    def header(self):
+        self.set_font('Arial', 'B', 16)
+        self.set_text_color(30, 58, 95)
+        self.cell(0, 10, 'GridToDash Professional Report', 0, 1, 'C')
+        self.ln(5)
+    
+    def footer(self):
+        self.set_y(-20)
+        self.set_font('Arial', 'I', 8)
+        self.set_text_color(128, 128, 128)
+        self.cell(0, 10, 'Generated by GridToDash - Professional Automation', 0, 0, 'C')
+        self.set_x(self.l_margin)
+        self.cell(0, 10, f'Page {self.page_no()} of {{nb}}', 0, 0, 'R')
+
+
+def _format_number(value):
+    return f"{value:,.2f}" if abs(value) < 1e9 else f"{value:.3e}"
+
+
+def _add_profile_section(pdf, columns, profile):
+    """Column profile table: type, missing and distinct values, range and a small histogram."""
+    pdf.set_font('Arial', 'B', 14)
+    pdf.set_text_color(30, 58, 95)
+    pdf.cell(0, 10, 'Column Profile', 0, 1, 'L')
+    pdf.ln(2)
+    
+    widths = [40, 18, 20, 22, 24, 24, 24, 18]
+    headers = ['Column', 'Type', 'Missing', 'Distinct (~)', 'Min', 'Median', 'Max', 'Distribution']
+    pdf.set_font('Arial', 'B', 7)
+    pdf.set_fill_color(30, 58, 95)
+    pdf.set_text_color(255, 255, 255)
+    for width, header in zip(widths, headers):
+        pdf.cell(width, 7, header, 1, 0, 'C', True)
+    pdf.ln()
+    
+    pdf.set_font('Arial', '', 7)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_fill_color(5, 150, 105)
+    for col in columns:
+        stats = profile['columns'].get(col)
+        if stats is None:
+            continue
+        if pdf.get_y() + 6 > pdf.page_break_trigger:
+            pdf.add_page()
+        numeric = stats['numeric'] and stats['count'] > 0
+        kind = 'Text'
+        if stats['numeric']:
+            kind = 'ID' if is_identifier(stats) else ('Integer' if stats.get('integer') else 'Number')
+        cells = [str(col)[:24], kind, f"{stats['nulls']:,}", f"{stats['distinct']:,}"]
+        if numeric:
+            cells += [_format_number(stats['min']), _format_number(stats['quantiles'][0.5]),
+                      _format_number(stats['max'])]
+        else:
+            cells += ['', '', '']
+        for i, (width, value) in enumerate(zip(widths, cells)):
+            pdf.cell(width, 6, value, 1, 0, 'L' if i < 2 else 'R')
+        
+        x, y = pdf.get_x(), pdf.get_y()
+        pdf.cell(widths[-1], 6, '', 1, 1)
+        if numeric:
+            counts = stats['histogram']['counts']
+            peak = max(counts) or 1
+            bar_width = (widths[-1] - 2) / len(counts)
+            for i, count in enumerate(counts):
+                height = 4 * count / peak
+                if height > 0:
+                    pdf.rect(x + 1 + i * bar_width, y + 5 - height, bar_width, height, 'F')
+    pdf.ln(10)
+
+
+def create_pdf(df, metrics, chart, filename, profile=None, table=None, output=None, report_id=None):
+    """
+    Create a PDF report with header, metrics, chart, and data table.
+    chart is a chart spec (see chart_spec), drawn as vector graphics.
+    With a column profile (see dataset_profile) a profile table of the
+    report columns is added after the metrics.
+    The data table shows the first 100 rows of df, or every row when table
+    gives the rows in blocks (see table_blocks); long tables are drawn by
+    worker processes (see pdf_table.py).
+    Pages are written to output (a binary file object) as they are
+    finished and None is returned; without output the PDF bytes are returned.
+    With a report_id (see report_key) the document is deterministic: the
+    ID is shown instead of the generation time and no creation date is
+    stored, so the same data and settings always give the same bytes.
+    """
+    total_rows = len(df)
+    buffer = None
+    if output is None:
+        output = buffer = BytesIO()
+    pdf = PDFReport(output)
+    pdf.creation_date = report_id is None
+    pdf.alias_nb_pages()
+    pdf.add_page()
+    
+    # Current Date
+    pdf.set_font('Arial', '', 10)
+    pdf.set_text_color(100, 100, 100)
+    if report_id is None:
+        pdf.cell(0, 10, f'Report Generated: {datetime.now().strftime("%Y-%m-%d %H:%M")}', 0, 1, 'R')
+    else:
+        pdf.cell(0, 10, f'Report ID: {report_id[:16]}', 0, 1, 'R')
+    pdf.ln(5)
+    
+    # Key Metrics Section
+    pdf.set_font('Arial', 'B', 14)
+    pdf.set_text_color(30, 58, 95)
+    pdf.cell(0, 10, 'Key Metrics', 0, 1, 'L')
+    pdf.ln(5)
+    
+    pdf.set_font('Arial', '', 11)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(60, 8, f"Total Records: {metrics['total_records']}", 0, 0, 'L')
+    pdf.cell(60, 8, f"Total Sum: {metrics['total_sum']:,.2f}", 0, 0, 'L')
+    pdf.cell(60, 8, f"Average Value: {metrics['average_value']:,.2f}", 0, 1, 'L')
+    pdf.cell(60, 8, f"Min: {metrics['min_value']:,.2f}", 0, 0, 'L')
+    pdf.cell(60, 8, f"Max: {metrics['max_value']:,.2f}", 0, 0, 'L')
+    pdf.cell(60, 8, f"Std Dev: {metrics['std_dev']:,.2f}", 0, 1, 'L')
+    if metrics['missing_values']:
+        pdf.cell(60, 8, f"Missing Values: {metrics['missing_values']:,}", 0, 1, 'L')
+    pdf.ln(10)
+    
+    # All Columns Info
+    pdf.set_font('Arial', 'B', 12)
+    pdf.set_text_color(30, 58, 95)
+    all_cols = df.columns.tolist()
+    pdf.cell(0, 8, f"Columns in data: {', '.join(all_cols)}", 0, 1, 'L')
+    pdf.ln(5)
+    
+    if profile is not None:
+        _add_profile_section(pdf, all_cols, profile)
+    
+    # Chart Section
+    pdf.set_font('Arial', 'B', 14)
+    pdf.set_text_color(30, 58, 95)
+    pdf.cell(0, 10, f'Chart ({min(total_rows, 100)} Entries)', 0, 1, 'L')
+    pdf.ln(5)
+    
+    draw_pdf_chart(pdf, chart)
+    pdf.ln(10)
+    
+    # Data Table Section
+    pdf.set_font('Arial', 'B', 14)
+    pdf.set_text_color(30, 58, 95)
+    if table is None:
+        pdf.cell(0, 10, f'Data Preview (First {min(total_rows, 100)} Rows)', 0, 1, 'L')
+        table = [df.head(100)]
+        table_rows = min(total_rows, 100)
+    else:
+        pdf.cell(0, 10, f"Data (All {metrics['total_records']:,} Rows)", 0, 1, 'L')
+        table_rows = metrics['total_records']
+    pdf.ln(5)
+    draw_table(pdf, df.columns.tolist(), table, table_rows)
+    
+    pdf.close()
+    return buffer.getvalue() if buffer is not None else None
+
+
+def report_key(data_key, **settings):
+    """
+    ETag-style key of a report: a hash of the dataset key (its content
+    hash, see dataset_cache_key), every setting that changes the document
+    and the template and chart versions. Equal keys mean equal PDFs.
+    """
+    return dataset_key(data_key.encode('utf-8'), template=TEMPLATE_VERSION, chart_style=CHART_STYLE, **settings)
+
+
+def cached_report(key, render, output=None):
+    """
+    PDF of a report from the on-disk cache (see pdf_cache.py). On a miss
+    render(f) writes it to the binary file f, with report_id=key for a
+    deterministic document, and it is cached. Returns the PDF bytes, or
+    copies them to output and returns None.
+    """
+    path = open_report(key) or save_report(key, render)
+    if path is not None:
+        try:
+            with open(path, 'rb') as f:
+                if output is None:
+                    return f.read()
+                shutil.copyfileobj(f, output)
+            return None
+        except FileNotFoundError:
+            # Pruned by another process in the meantime: render it once more
+            pass
+    buffer = output if output is not None else BytesIO()
+    render(buffer)
+    return None if output is not None else buffer.getvalue()
+
+
+def build_report(uploaded_file, sheet_name=None, metric_col=None, x_axis_col=None,
+                 y_axis_col=None, pdf_columns=None, aggregation=None, full_table=False, output=None):
+    """
+    Run the whole chain for one file and return the PDF bytes, or write the
+    PDF to output (a binary file object).
+    Column choices default to what the web app preselects (see
+    default_columns): a numeric column that is not an identifier for metrics
+    and Y-axis, a text label column for X-axis, all columns in the PDF and
+    raw rows in the chart (aggregation groups them instead). The data table
+    shows the first 100 rows, or all of them with full_table.
+    Reports are served from the PDF cache when the same file was already
+    reported with the same settings.
+    """
+    key = report_key(dataset_cache_key(uploaded_file, sheet_name), metric=metric_col, x_axis=x_axis_col,
+                     y_axis=y_axis_col, columns=pdf_columns, aggregation=aggregation, full_table=full_table)
+    
+    def render(f):
+        _render_report(uploaded_file, sheet_name, metric_col, x_axis_col, y_axis_col, pdf_columns,
+                       aggregation, full_table, f, key)
+    return cached_report(key, render, output)
+
+
+def _render_report(uploaded_file, sheet_name, metric_col, x_axis_col, y_axis_col, pdf_columns,
+                   aggregation, full_table, output, report_id):
+    """Load, check the column choices and write the PDF of build_report() to output."""
+    dataset = load_dataset(uploaded_file, sheet_name)
+    df = dataset['df']
+    numeric_cols = list(dataset['numeric_cols'])
+    all_cols = df.columns.tolist()
+    
+    defaults = default_columns(dataset)
+    metric_col = metric_col or defaults['metric']
+    x_axis_col = x_axis_col or defaults['x_axis']
+    y_axis_col = y_axis_col or metric_col
+    pdf_columns = pdf_columns or all_cols
+    for col in [metric_col, y_axis_col]:
+        if col not in numeric_cols:
+            raise ValueError(f"Column '{col}' is not numeric.")
+    for col in [x_axis_col] + list(pdf_columns):
+        if col not in all_cols:
+            raise ValueError(f"Column '{col}' not found in the uploaded file.")
+    
+    metrics = calculate_key_metrics(df, metric_col, dataset_summary(dataset))
+    chart_numeric_cols = [col for col in pdf_columns if col in numeric_cols]
+    chart_cols = chart_numeric_cols if chart_numeric_cols else numeric_cols
+    chart = chart_spec(dataset, x_axis_col, y_axis_col, chart_cols, aggregation, uploaded_file)
+    table = table_blocks(dataset, list(pdf_columns), uploaded_file) if full_table else None
+    create_pdf(df[pdf_columns], metrics, chart, uploaded_file.name, dataset_profile(dataset),
+               table, output, report_id)
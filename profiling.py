@@ -0,0 +1,229 @@
+"""
+Column profiling for GridToDash
+Builds a per-column profile (missing values, approximate distinct count,
+approximate quantiles and a histogram) in one pass over row blocks with
+bounded memory, so it also runs on files that are streamed in chunks.
+Distinct counts use a HyperLogLog sketch and quantiles a t-digest style
+centroid sketch; the histogram is read from the quantile sketch.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# HyperLogLog precision: 2**12 registers, about 1.6% standard error
+HLL_PRECISION = 12
+
+# t-digest compression: at most about this many centroids per column
+DIGEST_SIZE = 200
+
+HISTOGRAM_BINS = 20
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# A whole-number column with (almost) one distinct value per row, numbered
+# without large gaps, is an identifier; small tables are never judged
+ID_DISTINCT_RATIO = 0.95
+ID_MIN_ROWS = 50
+
+
+class HyperLogLog:
+    """Approximate distinct counter over 64-bit hashes."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes):
+        if len(hashes) == 0:
+            return
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # rank = position of the first set bit in the remaining bits
+        # (frexp gives the bit length; exact since bits <= 53)
+        rank = bits + 1 - np.frexp(rest.astype(np.float64))[1]
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small cardinalities: linear counting is more accurate
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class Digest:
+    """
+    Quantile sketch: weighted centroids whose size shrinks towards the
+    tails (the t-digest k1 scale), so extreme quantiles stay accurate.
+    """
+
+    def __init__(self, size=DIGEST_SIZE):
+        self.size = size
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        if len(values) == 0:
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other):
+        if len(other.means) == 0:
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means = means[order]
+        weights = weights[order]
+        total = weights.sum()
+        left = (np.cumsum(weights) - weights) / total
+        # Centroids whose left edge falls in the same unit of k share a cluster
+        k = self.size / (2 * np.pi) * np.arcsin(np.clip(2 * left - 1, -1, 1))
+        cluster = np.floor(k - k[0]).astype(np.intp)
+        starts = np.flatnonzero(np.diff(cluster, prepend=-1))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(weights * means, starts) / self.weights
+
+    @property
+    def total(self):
+        return float(self.weights.sum())
+
+    def _points(self):
+        middles = np.cumsum(self.weights) - self.weights / 2
+        ranks = np.concatenate([[0.0], middles, [self.total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return ranks, values
+
+    def quantile(self, q):
+        ranks, values = self._points()
+        return float(np.interp(q * self.total, ranks, values))
+
+    def cdf(self, x):
+        ranks, values = self._points()
+        return np.interp(x, values, ranks) / self.total
+
+    def histogram(self, bins=HISTOGRAM_BINS):
+        """Equal-width histogram between min and max, read from the sketch."""
+        if self.min == self.max:
+            return {'edges': [self.min, self.max], 'counts': [int(self.total)]}
+        edges = np.linspace(self.min, self.max, bins + 1)
+        cumulative = np.round(self.cdf(edges) * self.total)
+        cumulative[0], cumulative[-1] = 0, self.total
+        return {'edges': edges.tolist(), 'counts': np.diff(cumulative).astype(int).tolist()}
+
+
+def _is_numeric(series):
+    return pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+
+
+class ColumnProfile:
+    """Sketches for one column."""
+
+    def __init__(self):
+        self.count = 0
+        self.nulls = 0
+        self.numeric = True
+        self.integer = True
+        self.distinct = HyperLogLog()
+        self.digest = Digest()
+
+    def update(self, series):
+        values = series.dropna()
+        self.count += len(values)
+        self.nulls += len(series) - len(values)
+        self.distinct.update(pd.util.hash_pandas_object(values, index=False).to_numpy())
+        if self.numeric and not _is_numeric(series):
+            # Text in any block makes the whole column text
+            self.numeric = False
+            self.digest = None
+        if self.numeric:
+            self.integer = self.integer and series.dtype.kind in 'iu'
+            self.digest.update(values.to_numpy(dtype='float64'))
+
+    def result(self):
+        profile = {
+            'numeric': self.numeric,
+            'count': self.count,
+            'nulls': self.nulls,
+            'distinct': min(self.distinct.count(), self.count)
+        }
+        if self.numeric and self.count:
+            profile.update({
+                'integer': self.integer,
+                'min': self.digest.min,
+                'max': self.digest.max,
+                'quantiles': {q: self.digest.quantile(q) for q in QUANTILES},
+                'histogram': self.digest.histogram()
+            })
+        return profile
+
+
+class DatasetProfiler:
+    """Profiles every column of a table block by block."""
+
+    def __init__(self):
+        self.rows = 0
+        self.columns = {}
+
+    def update(self, frame):
+        for col in frame.columns:
+            self.columns.setdefault(col, ColumnProfile()).update(frame[col])
+        self.rows += len(frame)
+
+    def result(self):
+        """Return {'rows': n, 'columns': {column: profile}}."""
+        return {'rows': self.rows,
+                'columns': {col: profile.result() for col, profile in self.columns.items()}}
+
+
+def profile_dataframe(df, block_rows=65536, profiler=None):
+    """
+    Profile an in-memory DataFrame, block by block like a stream.
+    Pass profiler to extend an existing profile (e.g. with appended rows).
+    Returns the DatasetProfiler; call result() for the profile.
+    """
+    profiler = profiler or DatasetProfiler()
+    for start in range(0, len(df), block_rows):
+        profiler.update(df.iloc[start:start + block_rows])
+    if not len(df) and not profiler.columns:
+        profiler.update(df)
+    return profiler
+
+
+def is_identifier(profile):
+    """True for sequential whole-number columns with about one distinct value per row (IDs, invoice numbers)."""
+    return bool(profile.get('numeric') and profile.get('integer') and profile['count'] >= ID_MIN_ROWS
+                and profile['distinct'] >= ID_DISTINCT_RATIO * profile['count']
+                and profile['max'] - profile['min'] < 2 * profile['count'])
+
+
+def suggest_columns(profile, columns, numeric_cols):
+    """
+    Pick default columns from a profile: the first numeric column that is
+    not an identifier for metrics, and for the X-axis the first text column
+    with more than one value (falling back to the first column).
+    """
+    stats = profile['columns']
+    metric = next((col for col in numeric_cols if col in stats and not is_identifier(stats[col])),
+                  numeric_cols[0])
+    x_axis = next((col for col in columns
+                   if col in stats and not stats[col]['numeric'] and stats[col]['distinct'] > 1),
+                  columns[0])
+    return {'metric': metric, 'x_axis': x_axis}
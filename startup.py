@@ -0,0 +1,47 @@
+"""
+Startup timing for GridToDash
+Prints, once per process, when the app first reached each startup stage
+(login page shown, data modules loaded, ...), so cold starts can be
+measured from the server log. Lives in its own module because Streamlit
+re-executes app.py on every rerun, while imported modules persist.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+# When this module was first imported: the start of the first app run
+STARTED = time.perf_counter()
+
+_stages = {}
+_lock = threading.Lock()
+
+
+def _record(stage, seconds, text):
+    with _lock:
+        if stage in _stages:
+            return
+        _stages[stage] = seconds
+    print(f"Startup: {stage} {text}")
+
+
+def mark(stage):
+    """Record the first time stage is reached, in seconds since start."""
+    seconds = time.perf_counter() - STARTED
+    _record(stage, seconds, f"after {seconds:.2f}s")
+
+
+@contextmanager
+def timed(stage):
+    """Record how long the first run of a block takes (e.g. a deferred import)."""
+    begin = time.perf_counter()
+    yield
+    seconds = time.perf_counter() - begin
+    _record(stage, seconds, f"took {seconds:.2f}s")
+
+
+def report():
+    """Return {stage: seconds} for the stages reached so far."""
+    with _lock:
+        return dict(_stages)
@@ -0,0 +1,123 @@
+"""
+Top-K selection for GridToDash
+Keeps the K best rows of a table that arrives in chunks or partitions,
+without materializing it. Each chunk is narrowed down with NumPy, and sorted
+runs are combined with a heap merge, so the result is the same as
+DataFrame.nlargest / nsmallest (keep='first') over the whole table: ties
+go to the row that comes first. Rows missing the first key are left out
+(pandas only adds them when fewer than K rows have one).
+"""
+
+import heapq
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+
+def _sort_keys(frame, by, ascending):
+    """
+    Per-row sort keys where smaller is better, and a mask of rows whose
+    first key is not missing. As in pandas, those rows are left out, while
+    missing values in the other keys come after every value.
+    """
+    keys = []
+    valid = np.ones(len(frame), dtype=bool)
+    for i, col in enumerate(by):
+        values = frame[col].to_numpy()
+        if values.dtype.kind in 'iu':
+            # ~v reverses integer order exactly, without overflow
+            keys.append(values if ascending else ~values)
+            continue
+        values = frame[col].to_numpy(dtype='float64', na_value=np.nan)
+        missing = np.isnan(values)
+        if i == 0:
+            valid &= ~missing
+        else:
+            # Flag first, and no NaN left in the keys: heapq compares them as tuples
+            keys.append(missing)
+            values = np.where(missing, 0.0, values)
+        keys.append(values if ascending else -values)
+    return keys, valid
+
+
+class TopK:
+    """
+    The k best rows by one or more columns (largest first, or smallest
+    first with ascending=True). Feed it chunks with update(), or combine
+    partial results from other workers with merge().
+    """
+
+    def __init__(self, k, by, ascending=False):
+        self.k = k
+        self.by = [by] if isinstance(by, str) else list(by)
+        self.ascending = ascending
+        self.rows_seen = 0
+        self._frame = None
+        self._positions = np.empty(0, dtype=np.int64)
+
+    def _candidates(self, frame, positions):
+        """Best rows of one chunk, sorted: (frame, positions)."""
+        keys, valid = _sort_keys(frame, self.by, self.ascending)
+        index = np.flatnonzero(valid)
+        if len(index) > self.k:
+            # Rows whose first key beats the k-th value, plus all ties with it
+            first = keys[0][index]
+            kth = np.partition(first, self.k - 1)[self.k - 1]
+            index = index[first <= kth]
+        # lexsort: last key is primary; position breaks ties
+        order = index[np.lexsort([positions[index]] + [key[index] for key in reversed(keys)])][:self.k]
+        return frame.iloc[order], positions[order]
+
+    def update(self, frame, positions=None):
+        """
+        Add a chunk of rows. positions are the rows' places in the whole
+        table (used to break ties); by default chunks are taken to follow
+        each other.
+        """
+        if positions is None:
+            positions = np.arange(self.rows_seen, self.rows_seen + len(frame))
+        self.rows_seen += len(frame)
+        if len(frame) == 0:
+            return
+        candidates = self._candidates(frame, np.asarray(positions, dtype=np.int64))
+        self._merge_runs([candidates])
+
+    def merge(self, other):
+        """Add the result of another TopK over a different part of the same table."""
+        self.rows_seen += other.rows_seen
+        if other._frame is not None:
+            self._merge_runs([(other._frame, other._positions)])
+
+    def _merge_runs(self, runs):
+        """Heap-merge sorted runs of (frame, positions) and keep the first k rows."""
+        if self._frame is not None:
+            runs = [(self._frame, self._positions)] + runs
+        streams = []
+        offset = 0
+        for frame, positions in runs:
+            keys, _ = _sort_keys(frame, self.by, self.ascending)
+            streams.append(zip(*keys, positions.tolist(), range(offset, offset + len(frame))))
+            offset += len(frame)
+        picked = [item[-1] for item in islice(heapq.merge(*streams), self.k)]
+
+        combined = pd.concat([frame for frame, _ in runs]) if len(runs) > 1 else runs[0][0]
+        self._frame = combined.iloc[picked]
+        self._positions = np.concatenate([positions for _, positions in runs])[picked]
+
+    def result(self):
+        """The best rows, best first, with their original index (None before any rows)."""
+        return self._frame
+
+
+def top_k(df, k, by, ascending=False, block_rows=None):
+    """
+    Like df.nlargest(k, by) (or nsmallest with ascending=True), optionally
+    working through df in blocks of block_rows.
+    """
+    selector = TopK(k, by, ascending)
+    step = block_rows or max(len(df), 1)
+    for start in range(0, len(df), step):
+        selector.update(df.iloc[start:start + step])
+    result = selector.result()
+    return df.iloc[0:0] if result is None else result
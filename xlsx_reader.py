@@ -0,0 +1,130 @@
+"""
+Streaming XLSX reader for GridToDash
+Reads worksheets with openpyxl in read-only mode, row by row, straight
+into per-column buffers. Styles and formulas are never loaded: cells come
+back as their cached values.
+"""
+
+import posixpath
+import zipfile
+from xml.etree import ElementTree
+
+import pandas as pd
+from openpyxl import load_workbook
+
+
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_RELS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def _workbook_part(archive):
+    """Path of the workbook part, from the package relationships."""
+    try:
+        rels = ElementTree.fromstring(archive.read('_rels/.rels'))
+    except KeyError:
+        return 'xl/workbook.xml'
+    for rel in rels.iter(f'{_RELS_NS}Relationship'):
+        if rel.get('Type', '').endswith('/officeDocument'):
+            return posixpath.normpath(rel.get('Target').lstrip('/'))
+    return 'xl/workbook.xml'
+
+
+def list_sheets(source):
+    """
+    Return the sheet names of a workbook, in workbook order. Only the
+    workbook part is read: no shared strings, dimensions or rows, so this
+    stays cheap on every rerun however large the sheets are.
+    """
+    _rewind(source)
+    with zipfile.ZipFile(source) as archive:
+        workbook = ElementTree.fromstring(archive.read(_workbook_part(archive)))
+    _rewind(source)
+    return [sheet.get('name') for sheet in workbook.iter(f'{_MAIN_NS}sheet')]
+
+
+def _column_names(header):
+    """
+    Name columns like pandas does: blanks become 'Unnamed: i', repeats get
+    '.n'. Unlike pandas, numeric headers become strings, so names are
+    strings as in CSV files.
+    """
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+# Rows between two progress callbacks
+PROGRESS_EVERY = 10000
+
+
+def read_xlsx(source, sheet_name=None, max_rows=None, progress=None):
+    """
+    Read one worksheet into a DataFrame.
+    The first row is the header (see _column_names); cells to the right of
+    it get 'Unnamed: i' columns, as in pandas. Reading stops after max_rows data rows,
+    so previews of huge sheets only touch the top of the file.
+    progress(rows, fraction) is called every PROGRESS_EVERY rows; the
+    fraction comes from the sheet dimension and is None when it is unknown.
+    """
+    _rewind(source)
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        expected = (sheet.max_row or 0) - 1
+        # Rows are padded to the used range, which formatted empty cells widen
+        header = list(header)
+        while header and header[-1] is None:
+            header.pop()
+        columns = _column_names(header)
+        width = len(columns)
+        buffers = [[] for _ in range(width)]
+
+        read = 0
+        blank_run = 0
+        for row in rows:
+            if max_rows is not None and read >= max_rows:
+                break
+            # Read-only sheets can report a larger dimension than the data:
+            # hold blank rows back until a non-blank row proves they belong
+            if all(value is None for value in row):
+                blank_run += 1
+                continue
+            for _ in range(blank_run):
+                for buffer in buffers:
+                    buffer.append(None)
+            read += blank_run + 1
+            blank_run = 0
+            last = len(row)
+            while last > width and row[last - 1] is None:
+                last -= 1
+            for i in range(width, last):
+                # Data beyond the header: new column, blank in the rows before
+                columns.append(f"Unnamed: {i}")
+                buffers.append([None] * (read - 1))
+            width = max(width, last)
+            for i in range(width):
+                buffers[i].append(row[i] if i < len(row) else None)
+            if progress and read % PROGRESS_EVERY == 0:
+                progress(read, min(1.0, read / expected) if expected > 0 else None)
+    finally:
+        workbook.close()
+
+    return pd.DataFrame({name: pd.Series(buffer) for name, buffer in zip(columns, buffers)})